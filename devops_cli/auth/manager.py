@@ -6,6 +6,7 @@ It acts as a facade, coordinating the AuthService, Stores, and other components.
 
 import functools
 import os
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 
@@ -15,6 +16,8 @@ from devops_cli.auth.utils import _ensure_auth_dir, _load_json, _save_json, AUTH
 
 # Auth configuration
 AUDIT_LOG = AUTH_DIR / "audit.log"
+AUDIT_LOG_ROTATED = AUTH_DIR / "audit.log.1"
+AUDIT_LOG_MAX_BYTES = 1024 * 1024
 LOCKOUT_FILE = AUTH_DIR / "lockout.json"
 
 # Security settings
@@ -35,8 +38,13 @@ def _log_audit(event: str, email: str = None, details: str = None):
 
     with open(AUDIT_LOG, "a") as f:
         f.write(log_entry)
+        size = f.tell()
     os.chmod(AUDIT_LOG, 0o600)
 
+    # Keep one previous generation instead of letting the log grow forever
+    if size > AUDIT_LOG_MAX_BYTES:
+        os.replace(AUDIT_LOG, AUDIT_LOG_ROTATED)
+
 
 class AuthManager:
     """Manages user authentication for DevOps CLI."""
@@ -220,8 +228,9 @@ class AuthManager:
         """Get recent audit logs."""
         if not AUDIT_LOG.exists():
             return []
-        lines = AUDIT_LOG.read_text().strip().split("\n")
-        return lines[-limit:]
+        with open(AUDIT_LOG) as f:
+            tail = deque((line.rstrip("\n") for line in f if line.strip()), maxlen=limit)
+        return list(tail)
 
     # ==================== Internal Methods ====================
 
@@ -15,6 +15,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import yaml
 
+from devops_cli.utils.file_cache import YamlLoader
+
 
 T = TypeVar("T", bound=Dict[str, Any])
 
@@ -25,7 +27,7 @@ class CacheEntry:
 
     data: Dict[str, Any]
     loaded_at: datetime
-    file_mtime: float
+    file_mtime: int
 
 
 class ConfigManager:
@@ -123,12 +125,9 @@ class ConfigManager:
         if default is None:
             default = {}
 
-        if not file_path.exists():
-            return default.copy()
-
         try:
-            with open(file_path) as f:
-                data = yaml.safe_load(f)
+            with open(file_path, "rb") as f:
+                data = yaml.load(f, Loader=YamlLoader)
                 return data if data is not None else default.copy()
         except yaml.YAMLError:
             return default.copy()
@@ -170,13 +169,10 @@ class ConfigManager:
 
             # Check for auto-reload
             if self._auto_reload:
-                file_path = self.CONFIG_FILES.get(key)
-                if file_path and file_path.exists():
-                    current_mtime = file_path.stat().st_mtime
-                    if current_mtime > entry.file_mtime:
-                        # File changed, invalidate cache
-                        del self._cache[key]
-                        return None
+                if self._file_mtime(key) != entry.file_mtime:
+                    # File changed or was removed, invalidate cache
+                    del self._cache[key]
+                    return None
 
             return entry.data
 
@@ -188,15 +184,37 @@ class ConfigManager:
             data: Data to cache
         """
         with self._lock:
-            file_path = self.CONFIG_FILES.get(key)
-            mtime = file_path.stat().st_mtime if file_path and file_path.exists() else 0
-
             self._cache[key] = CacheEntry(
                 data=data,
                 loaded_at=datetime.now(),
-                file_mtime=mtime,
+                file_mtime=self._file_mtime(key),
             )
 
+    def _file_mtime(self, key: str) -> int:
+        """Get a config file's modification time in nanoseconds, or 0 if missing.
+
+        Args:
+            key: Config key
+        """
+        file_path = self.CONFIG_FILES.get(key)
+        if file_path is None:
+            return 0
+        try:
+            return file_path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def set_auto_reload(self, enabled: bool) -> None:
+        """Enable or disable reloading configs when their files change.
+
+        Long-running processes such as the dashboard should enable this so
+        edits made from the CLI are picked up without a restart.
+
+        Args:
+            enabled: Whether to check file modification times on access
+        """
+        self._auto_reload = enabled
+
     def _invalidate_cache(self, key: str) -> None:
         """Invalidate a specific cache entry.
 
@@ -5,11 +5,17 @@ Supports both local and centralized config management strategies.
 """
 
 import re
+import sys
 import yaml
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, Set
 from enum import Enum
 
+# Secret reference types (interned so grouping compares by identity)
+AWS_SECRET_REF = sys.intern("AWS_SECRET")
+GITHUB_SECRET_REF = sys.intern("GITHUB_SECRET")
+ENV_VAR_REF = sys.intern("ENV_VAR")
+
 
 class ConfigType(Enum):
     """Configuration file types."""
@@ -27,6 +33,8 @@ class ConfigType(Enum):
 class ValidationResult:
     """Result of a configuration validation."""
 
+    __slots__ = ("valid", "errors", "warnings", "info", "secret_refs")
+
     def __init__(self):
         self.valid = True
         self.errors: List[str] = []
@@ -79,9 +87,7 @@ class ValidationResult:
             lines.append("\nSecret References Found:")
             grouped = {}
             for ref_type, name in self.secret_refs:
-                if ref_type not in grouped:
-                    grouped[ref_type] = []
-                grouped[ref_type].append(name)
+                grouped.setdefault(ref_type, []).append(name)
 
             for ref_type, names in grouped.items():
                 lines.append(f"  {ref_type}:")
@@ -163,11 +169,11 @@ class ConfigValidator:
         if isinstance(data, str):
             # Check for AWS Secrets Manager
             for match in self.AWS_SECRET_PATTERN.finditer(data):
-                self.result.add_secret_ref("AWS_SECRET", match.group(1))
+                self.result.add_secret_ref(AWS_SECRET_REF, match.group(1))
 
             # Check for GitHub Secrets
             for match in self.GITHUB_SECRET_PATTERN.finditer(data):
-                self.result.add_secret_ref("GITHUB_SECRET", match.group(1))
+                self.result.add_secret_ref(GITHUB_SECRET_REF, match.group(1))
 
             # Check for environment variables
             for match in self.ENV_VAR_PATTERN.finditer(data):
@@ -176,7 +182,7 @@ class ConfigValidator:
                 if "AWS_SECRET:" not in match.group(
                     0
                 ) and "GITHUB_SECRET:" not in match.group(0):
-                    self.result.add_secret_ref("ENV_VAR", var_name)
+                    self.result.add_secret_ref(ENV_VAR_REF, var_name)
 
             # Check for local file paths
             if self.LOCAL_FILE_PATTERN.match(data):
@@ -1,29 +1,123 @@
 """Business logic and data management for the dashboard."""
 
 import os
-import json
+import re
 import yaml
+import heapq
+import logging
 import fnmatch
+import functools
+import itertools
+import tempfile
+import threading
 from pathlib import Path
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
-from devops_cli.auth import AuthManager
+from devops_cli.auth.stores import USERS_FILE
+from devops_cli.auth.utils import _load_json
+from devops_cli.config.manager import config_manager
+from devops_cli.utils.file_cache import SignatureCache, YamlLoader, file_signature
+from .utils import TTLCache, json_dumps, json_loads
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path.home() / ".devops-cli"
 DEPLOYMENTS_FILE = CONFIG_DIR / "deployments.json"
+DEPLOYMENTS_LOG = CONFIG_DIR / "deployments.jsonl"
+MAX_DEPLOYMENTS = 100
+DEPLOYMENTS_COMPACT_BYTES = 256 * 1024
+DEPLOYMENTS_LOCK_FILE = CONFIG_DIR / "deployments.lock"
 ACTIVITY_FILE = CONFIG_DIR / "activity.json"
+ACTIVITY_CACHE_TTL = 3
+AUDIT_TAIL_BYTES = 8192
+
+# Registered users keyed by email, keyed by users.json's signature
+_users_cache: SignatureCache[Dict[str, dict]] = SignatureCache()
+
+# Characters that make a team pattern a glob rather than a plain name
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# teams.yaml as parsed here when config_manager reports it empty, keyed by
+# path and signature; None means the file is missing, blank or comments only
+_teams_fallback_cache: SignatureCache[Optional[dict]] = SignatureCache()
 
-auth_manager = AuthManager()
+# Pre-processed team patterns, keyed by the teams config they were built from
+_team_access_cache: SignatureCache[dict] = SignatureCache()
+
+# Merged, sorted activity, keyed by the source files' signatures
+_activity_cache: SignatureCache[list] = SignatureCache()
+
+# Custom activity entries as last read or written, keyed by file signature
+_activity_file_cache: SignatureCache[list] = SignatureCache()
+
+# Short-lived copy of load_activity's result so polling skips even the stats
+activity_cache = TTLCache(default_ttl=ACTIVITY_CACHE_TTL)
+
+# Writers run in worker threads; serialize their read-modify-write cycles
+_activity_lock = threading.Lock()
+_deployments_lock = threading.Lock()
 
 # ==================== Team-Based Access Control ====================
 
+# Used when teams.yaml exists but cannot be parsed: every resource list is
+# empty, so non-admins are denied rather than falling back to "*"
+_DENY_ALL_TEAMS = {
+    "teams": {
+        "default": {
+            "name": "Default Team",
+            "apps": [],
+            "servers": [],
+            "websites": [],
+            "repos": [],
+        }
+    }
+}
+
+
+def _parse_teams_file(teams_file: Path) -> Optional[dict]:
+    """Parse teams.yaml directly, failing closed if it is malformed.
+
+    config_manager turns parse errors into an empty config, which must not
+    be mistaken for a missing file and its allow-all default.
+    """
+    signature = file_signature(teams_file)
+    if signature is None or signature[1] == 0:
+        return None
+    signature = (teams_file, signature)
+    cached = _teams_fallback_cache.get(signature)
+    if cached is not None:
+        return cached or None
+
+    try:
+        with open(teams_file, "rb") as f:
+            data = yaml.load(f, Loader=YamlLoader)
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning("Could not parse %s, denying team access: %s", teams_file, e)
+        data = _DENY_ALL_TEAMS
+    # An empty dict marks "parsed, nothing there" so it is cached too
+    _teams_fallback_cache.set(signature, data or {})
+    return data or None
+
+
 def load_teams_config():
     """Load teams configuration."""
-    teams_file = CONFIG_DIR / "teams.yaml"
-    if teams_file.exists():
-        with open(teams_file) as f:
-            return yaml.safe_load(f) or {}
+    # Shares config_manager's cache; the dashboard turns on its auto-reload
+    data = config_manager.teams
+    if data:
+        return data
+    data = _parse_teams_file(config_manager.CONFIG_FILES["teams"])
+    if data is not None:
+        return data
     return {
         "teams": {
             "default": {
@@ -37,90 +131,241 @@ def load_teams_config():
     }
 
 
+def _load_users_indexed() -> Dict[str, dict]:
+    """Load users keyed by email, re-reading only when users.json changes."""
+    signature = file_signature(USERS_FILE)
+    if signature is None:
+        return {}
+
+    users = _users_cache.get(signature)
+    if users is None:
+        users = _users_cache.set(signature, _load_json(USERS_FILE))
+    return users
+
+
 def get_user_team(email: str) -> str:
-    """Get user's team using AuthManager."""
-    user_data = auth_manager.get_user_data(email)
+    """Get user's team from the registered users table."""
+    user_data = _load_users_indexed().get(email)
     if user_data:
         return user_data.get("team", "default")
     return "default"
 
 
-def get_team_permissions(team_name: str) -> dict:
-    """Get team's access permissions."""
-    config = load_teams_config()
-    teams = config.get("teams", {})
-    return teams.get(
-        team_name,
-        teams.get(
-            "default",
-            {"apps": ["*"], "servers": ["*"], "websites": ["*"], "repos": ["*"]},
-        ),
-    )
+@functools.lru_cache(maxsize=256)
+def _compile_patterns(patterns: tuple) -> re.Pattern:
+    """Compile a tuple of glob patterns into a single alternation regex."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+class ResourceAccess:
+    """Pre-processed access patterns for one team and resource type."""
+
+    __slots__ = ("patterns", "wildcard", "exact", "regex")
+
+    def __init__(self, patterns: tuple):
+        self.patterns = patterns
+        self.wildcard = "*" in patterns
+        # Plain names are checked with a set lookup; only real globs need regex
+        self.exact = frozenset(p for p in patterns if not _GLOB_CHARS.search(p))
+        globs = tuple(p for p in patterns if p not in self.exact)
+        self.regex = _compile_patterns(globs) if globs else None
+
+    def allows(self, resource_name: str) -> bool:
+        """Check if a resource name is covered by these patterns."""
+        if self.wildcard or resource_name in self.exact:
+            return True
+        return self.regex is not None and self.regex.match(resource_name) is not None
 
 
 def can_access_resource(resource_name: str, allowed_patterns: list) -> bool:
     """Check if user can access a resource based on patterns."""
-    for pattern in allowed_patterns:
-        if pattern == "*" or fnmatch.fnmatch(resource_name, pattern):
-            return True
-    return False
+    return ResourceAccess(tuple(allowed_patterns)).allows(resource_name)
+
+
+def _build_team_access(config: dict) -> Dict[str, Dict[str, ResourceAccess]]:
+    """Pre-process every team's pattern lists from a teams config."""
+    access = {}
+    for team_name, team in config.get("teams", {}).items():
+        if not isinstance(team, dict):
+            continue
+        access[team_name] = {
+            resource_type: ResourceAccess(tuple(patterns))
+            for resource_type, patterns in team.items()
+            if isinstance(patterns, list)
+        }
+    return access
+
+
+def get_team_access(
+    team_name: str, resource_type: str, missing: Optional["ResourceAccess"] = None
+) -> ResourceAccess:
+    """Get a team's pre-processed access patterns for a resource type.
+
+    ``missing`` is used when the team does not list the resource type at
+    all; it defaults to allowing everything.
+    """
+    config = load_teams_config()
+    # Rebuild only when load_teams_config returns a changed config
+    team_access = _team_access_cache.get(config)
+    if team_access is None:
+        team_access = _team_access_cache.set(config, _build_team_access(config))
+
+    teams = config.get("teams", {})
+    if team_name not in teams:
+        team_name = "default" if "default" in teams else None
+    if team_name is None:
+        return _ALLOW_ALL
+    return team_access.get(team_name, {}).get(resource_type, missing or _ALLOW_ALL)
 
 
 def filter_by_team_access(
     items: list, user_email: str, resource_type: str, name_key: str = "name"
 ) -> list:
     """Filter items based on team access."""
-    team = get_user_team(user_email)
-    permissions = get_team_permissions(team)
-    allowed = permissions.get(resource_type, ["*"])
-    return [
-        item for item in items if can_access_resource(item.get(name_key, ""), allowed)
-    ]
+    access = get_team_access(get_user_team(user_email), resource_type)
+    if access.wildcard:
+        return list(items)
+    return [item for item in items if access.allows(item.get(name_key, ""))]
+
+
+_ALLOW_ALL = ResourceAccess(("*",))
+DENY_ALL = ResourceAccess(())
 
 
 # ==================== Dynamic Data Storage ====================
 
 
-def load_deployments() -> list:
-    """Load deployments from file."""
+def _load_legacy_deployments() -> list:
+    """Load deployments from the old single-document JSON file."""
     if DEPLOYMENTS_FILE.exists():
-        with open(DEPLOYMENTS_FILE) as f:
-            return json.load(f).get("deployments", [])
+        with open(DEPLOYMENTS_FILE, "rb") as f:
+            return json_loads(f.read()).get("deployments", [])
     return []
 
 
+@contextmanager
+def _deployments_write_lock():
+    """Serialize deployments log writers across threads and worker processes.
+
+    Without fcntl (Windows) only threads in this process are serialized.
+    """
+    with _deployments_lock:
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(DEPLOYMENTS_LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _compact_deployments_log():
+    """Rewrite the deployments log keeping only the newest entries.
+
+    Callers hold _deployments_write_lock so no append lands mid-rewrite.
+    """
+    with open(DEPLOYMENTS_LOG, "rb") as f:
+        tail = deque(f, maxlen=MAX_DEPLOYMENTS)
+    _write_atomic(DEPLOYMENTS_LOG, b"".join(tail))
+
+
+def load_deployments() -> list:
+    """Load deployments from file, newest first."""
+    if not DEPLOYMENTS_LOG.exists():
+        return _load_legacy_deployments()
+
+    with open(DEPLOYMENTS_LOG, "rb") as f:
+        tail = deque(f, maxlen=MAX_DEPLOYMENTS)
+    return [json_loads(line) for line in reversed(tail) if line.strip()]
+
+
 def save_deployment(deployment: dict):
     """Save a new deployment."""
-    data = {"deployments": load_deployments()}
-    deployment["id"] = f"dep-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    deployment["deployed_at"] = datetime.now().isoformat() + "Z"
-    data["deployments"].insert(0, deployment)
-    # Keep last 100 deployments
-    data["deployments"] = data["deployments"][:100]
-    DEPLOYMENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(DEPLOYMENTS_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    now = datetime.now()
+    deployment["id"] = f"dep-{now.strftime('%Y%m%d%H%M%S')}"
+    deployment["deployed_at"] = now.isoformat() + "Z"
+    DEPLOYMENTS_LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    with _deployments_write_lock():
+        lines = []
+        if not DEPLOYMENTS_LOG.exists():
+            # Carry over history from the old format, oldest first
+            lines = [json_dumps(d) + "\n" for d in reversed(_load_legacy_deployments())]
+        lines.append(json_dumps(deployment) + "\n")
+        with open(DEPLOYMENTS_LOG, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+        # Appends are cheap; trim back to the last 100 only once the log grows
+        if DEPLOYMENTS_LOG.stat().st_size > DEPLOYMENTS_COMPACT_BYTES:
+            _compact_deployments_log()
     return deployment
 
 
+def _write_atomic(file_path: Path, data: bytes):
+    """Write a file via a uniquely named sibling and rename it into place.
+
+    Readers never see partial content, and concurrent writers in other
+    worker processes never share a temp file.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _load_activity_file(signature: Optional[Tuple[int, int]]) -> list:
+    """Load custom activity entries, reusing the last read or write if unchanged."""
+    if signature is None:
+        return []
+    entries = _activity_file_cache.get(signature)
+    if entries is not None:
+        return entries
+
+    try:
+        with open(ACTIVITY_FILE, "rb") as f:
+            entries = json_loads(f.read()).get("activities", [])
+    except Exception:
+        return []
+    return _activity_file_cache.set(signature, entries)
+
+
 def load_activity() -> list:
-    """Load activity logs from file."""
-    activities = []
-    # Load from auth audit log
+    """Load activity logs from file, re-reading only when a source changes."""
+    cached = activity_cache.get("activity")
+    if cached is not None:
+        return cached
+
     audit_file = CONFIG_DIR / "auth" / "audit.log"
-    if audit_file.exists():
-        try:
-            with open(audit_file, "r") as f:
-                lines = f.readlines()
+    signature = (file_signature(audit_file), file_signature(ACTIVITY_FILE))
+    activities = _activity_cache.get(signature)
+    if activities is not None:
+        activity_cache.set("activity", activities)
+        return activities
 
-            # Truncate if more than 10
-            if len(lines) > 10:
-                lines = lines[-10:]
-                try:
-                    with open(audit_file, "w") as f:
-                        f.writelines(lines)
-                except Exception:
-                    pass
+    audit_entries = []
+    # Load from auth audit log
+    if signature[0] is not None:
+        try:
+            # Only the last few entries are shown, so read just the tail
+            offset = max(0, audit_file.stat().st_size - AUDIT_TAIL_BYTES)
+            with open(audit_file, "rb") as f:
+                f.seek(offset)
+                lines = f.read().decode("utf-8", errors="ignore").splitlines()
+            if offset:
+                # The first line may have been cut by the seek
+                lines = lines[1:]
+            lines = lines[-10:]
 
             for line in lines:
                 try:
@@ -131,7 +376,7 @@ def load_activity() -> list:
                             action = entry_parts[1]
                             email = entry_parts[2] if len(entry_parts) > 2 else "system"
 
-                            activities.append(
+                            audit_entries.append(
                                 {
                                     "timestamp": timestamp,
                                     "type": (
@@ -150,31 +395,23 @@ def load_activity() -> list:
         except Exception:
             pass
 
-    # Load custom activity file
-    if ACTIVITY_FILE.exists():
-        try:
-            with open(ACTIVITY_FILE) as f:
-                activities.extend(json.load(f).get("activities", []))
-        except Exception:
-            pass
-
-    # Sort by timestamp desc
-    activities.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    return activities[:10]
+    # The audit log is appended oldest-first and the custom activity file
+    # is kept newest-first, so merge the two instead of sorting
+    merged = heapq.merge(
+        reversed(audit_entries),
+        _load_activity_file(signature[1]),
+        key=lambda x: x.get("timestamp", ""),
+        reverse=True,
+    )
+    activities = _activity_cache.set(signature, list(itertools.islice(merged, 10)))
+    activity_cache.set("activity", activities)
+    return activities
 
 
 def log_activity(
     activity_type: str, user: str, action: str, status: str = "success", ip: str = "-"
 ):
     """Log an activity."""
-    data = {"activities": []}
-    if ACTIVITY_FILE.exists():
-        try:
-            with open(ACTIVITY_FILE) as f:
-                data = json.load(f)
-        except Exception:
-            pass
-
     activity = {
         "timestamp": datetime.now().isoformat() + "Z",
         "type": activity_type,
@@ -183,9 +420,13 @@ def log_activity(
         "ip": ip,
         "status": status,
     }
-    data["activities"].insert(0, activity)
-    data["activities"] = data["activities"][:10]
 
-    ACTIVITY_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(ACTIVITY_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    with _activity_lock:
+        entries = _load_activity_file(file_signature(ACTIVITY_FILE))
+        entries = [activity] + entries[:9]
+
+        ACTIVITY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(ACTIVITY_FILE, json_dumps({"activities": entries}, indent=True).encode())
+        # Remember what was written so the next read skips the disk
+        _activity_file_cache.set(file_signature(ACTIVITY_FILE), entries)
+        activity_cache.delete("activity")
@@ -1,35 +1,52 @@
 """Main entry point for the dashboard application."""
 
 import os
+import asyncio
+import logging
+import functools
 from pathlib import Path
 from typing import List, Optional
-from datetime import datetime
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from jinja2 import FileSystemBytecodeCache
 
 from devops_cli.auth import AuthManager
-from .utils import RateLimiter, TTLCache
+from devops_cli.config.manager import config_manager
+from devops_cli.monitoring.checker import HTTPClientPool
+from .logic import load_activity
+from .utils import (
+    REDIS_AVAILABLE,
+    FastJSONResponse,
+    RateLimiter,
+    RedisSessionStore,
+    TTLCache,
+)
+
+logger = logging.getLogger(__name__)
 
 # Dashboard paths
 DASHBOARD_DIR = Path(__file__).parent
 STATIC_DIR = DASHBOARD_DIR / "static"
 TEMPLATES_DIR = DASHBOARD_DIR / "templates"
 CONFIG_DIR = Path.home() / ".devops-cli"
+JINJA_CACHE_DIR = CONFIG_DIR / "jinja_cache"
+DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "3000"))
 
+@functools.lru_cache(maxsize=1)
 def get_cors_origins() -> List[str]:
     """Get allowed CORS origins from config file or environment."""
     env_origins = os.getenv("DASHBOARD_CORS_ORIGINS")
     if env_origins:
         return [origin.strip() for origin in env_origins.split(",")]
 
-    port = int(os.getenv("DASHBOARD_PORT", "3000"))
     return [
-        f"http://localhost:{port}",
-        f"http://127.0.0.1:{port}",
+        f"http://localhost:{DASHBOARD_PORT}",
+        f"http://127.0.0.1:{DASHBOARD_PORT}",
     ]
 
 ALLOWED_ORIGINS = get_cors_origins()
@@ -41,18 +58,43 @@ monitoring_cache = TTLCache(default_ttl=30)
 auth_manager = AuthManager()
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
-# Session storage (in-memory)
-sessions = {}
+# Session storage, expired and bounded by the cache. Set REDIS_URL to
+# share sessions between workers instead of keeping them in memory.
+SESSION_MAX_AGE = 8 * 3600
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_SESSIONS = bool(REDIS_URL and REDIS_AVAILABLE)
+if REDIS_URL and not REDIS_AVAILABLE:
+    logger.warning(
+        "REDIS_URL is set but the redis package is not installed; "
+        "sessions stay in memory and are not shared between workers"
+    )
+if REDIS_SESSIONS:
+    sessions = RedisSessionStore(REDIS_URL, default_ttl=SESSION_MAX_AGE)
+else:
+    sessions = TTLCache(default_ttl=SESSION_MAX_AGE, max_entries=10_000)
+
+async def session_io(func, *args):
+    """Call a session store method without blocking the event loop.
+
+    Redis calls go to a worker thread; the in-memory store is called inline.
+    """
+    if REDIS_SESSIONS:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
 
 def get_current_user(request: Request) -> Optional[dict]:
     """Get current user from session cookie."""
     session_id = request.cookies.get("session_id")
-    if session_id and session_id in sessions:
-        session = sessions[session_id]
-        if datetime.fromisoformat(session["expires_at"]) > datetime.now():
+    if session_id:
+        session = sessions.get(session_id)
+        if session:
             return session["user"]
     return None
 
+async def get_current_user_async(request: Request) -> Optional[dict]:
+    """Get current user from session cookie, for async handlers."""
+    return await session_io(get_current_user, request)
+
 def require_auth(request: Request) -> dict:
     """Require authentication."""
     user = get_current_user(request)
@@ -67,12 +109,59 @@ def require_admin(request: Request) -> dict:
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
 
+async def _cleanup_sessions():
+    """Periodically drop expired sessions."""
+    while True:
+        await asyncio.sleep(60)
+        sessions.cleanup()
+
+def _enable_bytecode_cache():
+    """Share compiled templates across restarts and workers.
+
+    Runs at startup rather than import so importing the module never
+    touches the config directory; without a writable cache directory the
+    templates are simply compiled in memory.
+    """
+    try:
+        JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning("Template bytecode cache disabled: %s", e)
+        return
+    templates.env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
+
+def _warm_caches():
+    """Load config files up front so the first requests find them cached.
+
+    Best effort: a broken file is logged here and reported again by the
+    requests that need it, rather than stopping the dashboard from starting.
+    """
+    try:
+        for name in ("apps", "servers", "websites", "aws", "teams"):
+            getattr(config_manager, name)
+        load_activity()
+    except Exception as e:
+        logger.warning("Could not warm dashboard caches: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background housekeeping and release shared resources on shutdown."""
+    # The dashboard outlives CLI edits to the config files, so pick them up
+    config_manager.set_auto_reload(True)
+    _enable_bytecode_cache()
+    await asyncio.to_thread(_warm_caches)
+    cleanup_task = asyncio.create_task(_cleanup_sessions())
+    yield
+    cleanup_task.cancel()
+    await HTTPClientPool().close()
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
         title="DevOps CLI Dashboard",
         description="Web interface for DevOps CLI",
         version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     app.add_middleware(
@@ -89,7 +178,7 @@ def create_app() -> FastAPI:
     @app.get("/", response_class=HTMLResponse)
     async def index(request: Request):
         """Main dashboard page."""
-        user = get_current_user(request)
+        user = await get_current_user_async(request)
         if not user:
             return templates.TemplateResponse("login.html", {"request": request})
         return templates.TemplateResponse("index.html", {"request": request, "user": user})
@@ -1,5 +1,6 @@
 """Activity and deployment routes for the dashboard."""
 
+import asyncio
 from fastapi import APIRouter, Depends
 from ..main import require_auth
 from ..logic import load_activity, load_deployments, save_deployment
@@ -20,4 +21,4 @@ async def api_deployments(user: dict = Depends(require_auth)):
 async def api_create_deployment(deployment: dict, user: dict = Depends(require_auth)):
     """Record a new deployment."""
     deployment["user"] = user["email"]
-    return save_deployment(deployment)
+    return await asyncio.to_thread(save_deployment, deployment)
@@ -1,71 +1,87 @@
 """Application routes for the dashboard."""
 
-import json
+import logging
+import time
 import asyncio
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import StreamingResponse
-import httpx
 from ..main import require_auth
 from ..logic import filter_by_team_access
-from ..services import fetch_cloudwatch_logs, get_document_logs
-from devops_cli.utils.log_formatters import mask_secrets
+from ..services import fetch_cloudwatch_logs, get_document_logs, get_logs_client
+from ..utils import json_dumps
+from devops_cli.commands.admin import load_apps_config
+from devops_cli.monitoring.checker import HTTPClientPool
+from devops_cli.utils.file_cache import SignatureCache
+from devops_cli.utils.log_formatters import detect_log_level, mask_secrets
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/apps", tags=["apps"])
 
+# Normalized app list, keyed by the apps config it was built from
+_apps_view_cache: SignatureCache[list] = SignatureCache()
+
+
+def _build_apps_view(config: dict) -> list:
+    """Normalize the apps config into the list served by the apps endpoint."""
+    # Handle cases where config might be just the apps dict or wrapped in 'apps' key
+    apps = config.get("apps", {}) if "apps" in config else config
+
+    result = []
+    for name, app_data in apps.items():
+        if not isinstance(app_data, dict):
+            continue
+        
+        # Extract log and health info from different possible locations
+        logs_cfg = app_data.get("logs") or {}
+        if not logs_cfg and app_data.get("log_group"):
+            logs_cfg = {
+                "type": "cloudwatch",
+                "log_group": app_data.get("log_group"),
+                "region": app_data.get("region")
+            }
+            
+        health_cfg = app_data.get("health") or app_data.get("health_check") or {}
+
+        result.append(
+            {
+                "name": name,
+                "display_name": app_data.get("name", name),
+                "type": app_data.get("type", "unknown"),
+                "description": app_data.get("description", ""),
+                "health": health_cfg,
+                "logs": logs_cfg,
+            }
+        )
+    return result
+
+
 @router.get("")
 async def api_apps(user: dict = Depends(require_auth)):
     """Get all applications (filtered by team access)."""
-    from devops_cli.commands.admin import load_apps_config
-
     try:
         config = load_apps_config()
-        # Handle cases where config might be just the apps dict or wrapped in 'apps' key
-        apps = config.get("apps", {}) if "apps" in config else config
-
-        result = []
-        for name, app_data in apps.items():
-            if not isinstance(app_data, dict):
-                continue
-            
-            # Extract log and health info from different possible locations
-            logs_cfg = app_data.get("logs") or {}
-            if not logs_cfg and app_data.get("log_group"):
-                logs_cfg = {
-                    "type": "cloudwatch",
-                    "log_group": app_data.get("log_group"),
-                    "region": app_data.get("region")
-                }
-                
-            health_cfg = app_data.get("health") or app_data.get("health_check") or {}
-
-            result.append(
-                {
-                    "name": name,
-                    "display_name": app_data.get("name", name),
-                    "type": app_data.get("type", "unknown"),
-                    "description": app_data.get("description", ""),
-                    "health": health_cfg,
-                    "logs": logs_cfg,
-                }
-            )
+        # Rebuild only when load_apps_config returns a changed config
+        result = _apps_view_cache.get(config)
+        if result is None:
+            result = _apps_view_cache.set(config, _build_apps_view(config))
 
         # Only filter if not an admin
         if user.get("role") != "admin":
             result = filter_by_team_access(result, user["email"], "apps")
 
-        print(f"DEBUG: api_apps returning {len(result)} apps")
+        logger.debug("api_apps returning %d apps", len(result))
         return {"apps": result}
     except Exception as e:
-        print(f"DEBUG: api_apps error: {e}")
+        logger.warning("api_apps error: %s", e)
         return {"apps": [], "error": str(e)}
 
 
 @router.get("/{app_name}/health")
 async def api_app_health(app_name: str, user: dict = Depends(require_auth)):
     """Check app health."""
-    from devops_cli.commands.admin import load_apps_config
-
     config = load_apps_config()
     apps = config.get("apps", {})
 
@@ -86,26 +102,27 @@ async def api_app_health(app_name: str, user: dict = Depends(require_auth)):
     timeout = health_config.get("timeout", 10)
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            start = datetime.now()
-            response = await client.get(url)
-            elapsed = (datetime.now() - start).total_seconds() * 1000
-
-            if response.status_code == expected_status:
-                return {
-                    "status": "healthy",
-                    "response_time": round(elapsed, 2),
-                    "status_code": response.status_code,
-                    "url": url,
-                }
-            else:
-                return {
-                    "status": "unhealthy",
-                    "response_time": round(elapsed, 2),
-                    "status_code": response.status_code,
-                    "expected": expected_status,
-                    "url": url,
-                }
+        # Reuse the monitoring connection pool instead of a client per request
+        client = await HTTPClientPool().get_client()
+        start = time.perf_counter()
+        response = await client.get(url, timeout=timeout, follow_redirects=False)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if response.status_code == expected_status:
+            return {
+                "status": "healthy",
+                "response_time": round(elapsed, 2),
+                "status_code": response.status_code,
+                "url": url,
+            }
+        else:
+            return {
+                "status": "unhealthy",
+                "response_time": round(elapsed, 2),
+                "status_code": response.status_code,
+                "expected": expected_status,
+                "url": url,
+            }
     except Exception as e:
         return {"status": "unhealthy", "error": str(e), "url": url}
 
@@ -118,8 +135,6 @@ async def api_app_logs(
     user: dict = Depends(require_auth),
 ):
     """Get application logs."""
-    from devops_cli.commands.admin import load_apps_config
-
     config = load_apps_config()
     apps = config.get("apps", {})
 
@@ -135,12 +150,16 @@ async def api_app_logs(
     region = logs_config.get("region") or app_config.get("region") or "us-east-1"
     
     log_type = logs_config.get("type") or ("cloudwatch" if log_group else "none")
+    # Levels are emitted uppercase; filter while reading rather than afterwards
+    level_filter = None if level.lower() == "all" else level.upper()
 
     if log_type == "cloudwatch" and log_group:
         aws_role = app_config.get("aws_role")
-        return await fetch_cloudwatch_logs(log_group, region, lines, aws_role=aws_role)
+        return await fetch_cloudwatch_logs(
+            log_group, region, lines, aws_role=aws_role, level_filter=level_filter
+        )
     
-    doc_logs = get_document_logs(app_name)
+    doc_logs = get_document_logs(app_name, level_filter=level_filter)
     if doc_logs.get("success"):
         return doc_logs
     
@@ -149,8 +168,6 @@ async def api_app_logs(
 @router.get("/{app_name}/logs/stream")
 async def api_app_logs_stream(app_name: str, request: Request):
     """Stream application logs via SSE."""
-    from devops_cli.commands.admin import load_apps_config
-    
     config = load_apps_config()
     apps = config.get("apps", {})
     if app_name not in apps:
@@ -164,53 +181,56 @@ async def api_app_logs_stream(app_name: str, request: Request):
     region = logs_config.get("region") or app_config.get("region") or "us-east-1"
 
     async def log_generator():
-        yield f"data: {json.dumps({'timestamp': datetime.now().isoformat(), 'level': 'INFO', 'message': f'Connecting to {app_name}...', 'source': 'system'})}\n\n"
+        yield f"data: {json_dumps({'timestamp': datetime.now().isoformat(), 'level': 'INFO', 'message': f'Connecting to {app_name}...', 'source': 'system'})}\n\n"
 
         if not log_group:
-            yield f"data: {json.dumps({'timestamp': datetime.now().isoformat(), 'level': 'ERROR', 'message': 'No log group configured', 'source': 'system'})}\n\n"
+            yield f"data: {json_dumps({'timestamp': datetime.now().isoformat(), 'level': 'ERROR', 'message': 'No log group configured', 'source': 'system'})}\n\n"
             return
 
         try:
-            from devops_cli.utils.aws_helpers import get_aws_session
-            session = get_aws_session(role_name=app_config.get("aws_role"), region=region)
-            client = session.client("logs")
+            # boto3 blocks, so keep its calls off the event loop
+            client = await get_logs_client(region, app_config.get("aws_role"))
             last_timestamp = int((datetime.now().timestamp() - 300) * 1000)
-            seen_ids = set()
+            # Each poll restarts at last_timestamp, so only events sharing
+            # that exact millisecond can be replayed
+            ids_at_last_timestamp = set()
 
             while True:
                 if await request.is_disconnected():
                     break
 
                 try:
-                    response = client.filter_log_events(
+                    response = await asyncio.to_thread(
+                        client.filter_log_events,
                         logGroupName=log_group,
                         startTime=last_timestamp,
                         interleaved=True,
-                        limit=10
+                        limit=100
                     )
 
                     for event in response.get("events", []):
-                        if event["eventId"] in seen_ids: continue
-                        seen_ids.add(event["eventId"])
-                        
-                        message = event.get("message", "")
-                        level = "INFO"
-                        if "ERROR" in message.upper(): level = "ERROR"
-                        elif "WARN" in message.upper(): level = "WARN"
+                        event_ts = event["timestamp"]
+                        if event_ts == last_timestamp and event["eventId"] in ids_at_last_timestamp:
+                            continue
+                        if event_ts > last_timestamp:
+                            last_timestamp = event_ts
+                            ids_at_last_timestamp = set()
+                        ids_at_last_timestamp.add(event["eventId"])
 
+                        message = event.get("message", "")
                         log_data = {
                             'timestamp': datetime.fromtimestamp(event['timestamp']/1000).isoformat(),
-                            'level': level,
+                            'level': detect_log_level(message),
                             'message': mask_secrets(message),
                             'source': event.get('logStreamName', 'aws')
                         }
-                        yield f"data: {json.dumps(log_data)}\n\n"
-                        last_timestamp = max(last_timestamp, event["timestamp"])
-
-                    if len(seen_ids) > 1000: seen_ids = set(list(seen_ids)[-500:])
-                except: pass
+                        yield f"data: {json_dumps(log_data)}\n\n"
+                except Exception as e:
+                    # Keep polling through transient AWS errors, but let
+                    # cancellation on client disconnect propagate
+                    logger.warning("filter_log_events failed for %s: %s", log_group, e)
                 await asyncio.sleep(5)
         except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield f"data: {json_dumps({'error': str(e)})}\n\n"
 
     return StreamingResponse(log_generator(), media_type="text/event-stream")
\ No newline at end of file
@@ -1,9 +1,16 @@
 """Authentication routes for the dashboard."""
 
+import asyncio
 import secrets
-from datetime import datetime, timedelta
 from fastapi import APIRouter, Request, HTTPException, Response
-from ..main import auth_manager, auth_rate_limiter, sessions, templates
+from ..main import (
+    auth_manager,
+    auth_rate_limiter,
+    sessions,
+    session_io,
+    templates,
+    SESSION_MAX_AGE,
+)
 from ..logic import log_activity
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -47,22 +54,17 @@ async def api_login(request: Request, response: Response):
 
             if user_info:
                 session_id = secrets.token_urlsafe(32)
-                expires_at = datetime.now() + timedelta(hours=8)
-                
-                sessions[session_id] = {
-                    "user": user_info,
-                    "expires_at": expires_at.isoformat(),
-                }
+                await session_io(sessions.set, session_id, {"user": user_info})
 
                 response.set_cookie(
                     key="session_id",
                     value=session_id,
                     httponly=True,
-                    max_age=8 * 3600,
+                    max_age=SESSION_MAX_AGE,
                     samesite="lax",
                 )
 
-                log_activity("auth", email, "Dashboard Login", ip=client_ip)
+                await asyncio.to_thread(log_activity, "auth", email, "Dashboard Login", ip=client_ip)
                 return {"success": True, "user": user_info}
         
         return {"success": False, "error": "Invalid email or token"}
@@ -74,10 +76,10 @@ async def api_login(request: Request, response: Response):
 async def api_logout(request: Request, response: Response):
     """Logout endpoint."""
     session_id = request.cookies.get("session_id")
-    if session_id in sessions:
-        user = sessions[session_id]["user"]
-        log_activity("auth", user["email"], "Dashboard Logout")
-        del sessions[session_id]
+    # Look up and remove the session in one step
+    session = await session_io(sessions.pop, session_id) if session_id else None
+    if session:
+        await asyncio.to_thread(log_activity, "auth", session["user"]["email"], "Dashboard Logout")
 
     response.delete_cookie("session_id")
     return {"success": True}
@@ -85,8 +87,8 @@ async def api_logout(request: Request, response: Response):
 @router.get("/status")
 async def auth_status(request: Request):
     """Check current auth status."""
-    from ..main import get_current_user
-    user = get_current_user(request)
+    from ..main import get_current_user_async
+    user = await get_current_user_async(request)
     if user:
         return {"authenticated": True, "user": user}
     return {"authenticated": False}
@@ -1,9 +1,15 @@
 """GitHub routes for the dashboard."""
 
+import re
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import APIRouter, Depends
-import httpx
 from ..main import require_auth, github_cache
-from ..logic import get_user_team
+from ..logic import get_user_team, get_team_access
+from devops_cli.config.settings import load_config
+from devops_cli.monitoring.checker import HTTPClientPool
 from devops_cli.utils.github_helper import (
     get_latest_commit, 
     get_workflow_runs,
@@ -14,11 +20,181 @@ from devops_cli.utils.github_helper import (
 
 router = APIRouter(prefix="/api/github", tags=["github"])
 
+# Cached (etag, body, link) entries outlive the response caches so expired
+# entries can still be revalidated with a cheap conditional request
+ETAG_TTL_SECONDS = 3600
+# Page number of the rel="last" URL in a Link header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# One [lock, users] pair per response cache key being fetched, so concurrent
+# misses share a single fetch. Keys come from request paths, so an entry is
+# dropped as soon as nobody holds or waits on its lock.
+_fetch_locks: Dict[str, List[Any]] = {}
+
+
 def get_github_config():
     """Load GitHub config from global settings."""
-    from devops_cli.config.settings import load_config
     return load_config()
 
+
+async def _github_fetch(url: str, headers: dict) -> Tuple[int, Any, Optional[str]]:
+    """GET a GitHub API URL, revalidating any cached body with its ETag.
+
+    Returns:
+        Tuple of (status_code, parsed JSON body or None, Link header or None)
+    """
+    cache_key = f"etag:{url}"
+    cached = github_cache.get(cache_key)
+    if cached:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    client = await HTTPClientPool().get_client()
+    resp = await client.get(url, headers=headers, timeout=10.0)
+    if resp.status_code == 304 and cached:
+        # Not modified: no body and no rate-limit cost
+        return 200, cached[1], cached[2]
+    if resp.status_code != 200:
+        return resp.status_code, None, None
+
+    data = resp.json()
+    etag = resp.headers.get("ETag")
+    link = resp.headers.get("Link")
+    if etag:
+        github_cache.set(cache_key, (etag, data, link), ttl=ETAG_TTL_SECONDS)
+    return 200, data, link
+
+
+async def _github_get(url: str, headers: dict) -> Tuple[int, Any]:
+    """GET a GitHub API URL through the ETag cache, ignoring pagination.
+
+    Returns:
+        Tuple of (status_code, parsed JSON body or None)
+    """
+    status_code, data, _ = await _github_fetch(url, headers)
+    return status_code, data
+
+
+def _last_page(link: Optional[str]) -> int:
+    """Get the last page number from a GitHub Link header (1 if absent)."""
+    match = _LAST_PAGE_RE.search(link or "")
+    return int(match[1]) if match else 1
+
+# Default branch and its head commit in one round trip. Actions workflow
+# runs are not exposed over GraphQL, so those still come from REST.
+_HEAD_COMMIT_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit { oid message url author { name date } }
+      }
+    }
+  }
+}
+"""
+
+
+async def _get_head_commit_graphql(owner: str, repo: str, token: str) -> Optional[dict]:
+    """Fetch the default branch's latest commit with a single GraphQL query.
+
+    Returns:
+        Commit dict shaped like get_latest_commit's, or None on error
+    """
+    client = await HTTPClientPool().get_client()
+    resp = await client.post(
+        "https://api.github.com/graphql",
+        json={"query": _HEAD_COMMIT_QUERY, "variables": {"owner": owner, "name": repo}},
+        headers={"Authorization": f"bearer {token}"},
+        timeout=10.0,
+    )
+    if resp.status_code != 200:
+        return None
+
+    repository = (resp.json().get("data") or {}).get("repository") or {}
+    target = (repository.get("defaultBranchRef") or {}).get("target")
+    if not target:
+        return None
+    return {
+        "sha": target["oid"][:7],
+        "sha_full": target["oid"],
+        "message": target["message"].split("\n")[0],
+        "author": target["author"]["name"],
+        "date": target["author"]["date"],
+        "url": target["url"],
+    }
+
+
+async def _get_head_commit_rest(owner: str, repo: str, token: str) -> Optional[dict]:
+    """Resolve the default branch, then fetch its latest commit over REST."""
+    default_branch = "main"
+    try:
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if token:
+            headers["Authorization"] = f"token {token}"
+        status_code, repo_data = await _github_get(
+            f"https://api.github.com/repos/{owner}/{repo}", headers
+        )
+        if status_code == 200:
+            default_branch = repo_data.get("default_branch", "main")
+    except:
+        pass
+
+    return await asyncio.to_thread(get_latest_commit, owner, repo, default_branch, token)
+
+
+@asynccontextmanager
+async def _fetch_lock(cache_key: str):
+    """Hold the lock that serializes cache misses for one cache key."""
+    entry = _fetch_locks.get(cache_key)
+    if entry is None:
+        entry = _fetch_locks[cache_key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _fetch_locks[cache_key]
+
+
+async def _fetch_org_repos(org: str, token: str) -> list:
+    """Fetch every repository in an org, mapped for the dashboard."""
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+
+    url = f"https://api.github.com/orgs/{org}/repos?per_page=100&sort=updated"
+    status_code, all_repos, link = await _github_fetch(url, headers)
+    if status_code != 200:
+        raise RuntimeError(f"GitHub API error: {status_code}")
+
+    # The first page tells us how many follow; fetch the rest together
+    last_page = _last_page(link)
+    if last_page > 1:
+        pages = await asyncio.gather(
+            *(_github_get(f"{url}&page={n}", headers) for n in range(2, last_page + 1))
+        )
+        for page_status, page in pages:
+            if page_status != 200:
+                raise RuntimeError(f"GitHub API error: {page_status}")
+            all_repos = all_repos + page
+
+    mapped_repos = []
+    for r in all_repos:
+        mapped_repos.append({
+            "name": r["name"],
+            "url": r["html_url"],
+            "description": r.get("description", ""),
+            "private": r.get("private", False),
+            "default_branch": r.get("default_branch", "main"),
+            "language": r.get("language"),
+            "stars": r.get("stargazers_count", 0),
+            "forks": r.get("forks_count", 0),
+        })
+    return mapped_repos
+
+
 @router.get("/repos")
 async def api_github_repos(user: dict = Depends(require_auth)):
     """Fetch GitHub org repos with team-based filtering and caching."""
@@ -31,49 +207,31 @@ async def api_github_repos(user: dict = Depends(require_auth)):
         return {"error": "GitHub organization not configured", "repos": []}
 
     cache_key = f"github_repos:{org}"
-    cached_repos = github_cache.get(cache_key)
-
-    if cached_repos is None:
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
+    all_repos = github_cache.get(cache_key)
 
-        try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    f"https://api.github.com/orgs/{org}/repos?per_page=100&sort=updated",
-                    headers=headers,
-                    timeout=10.0,
-                )
-                if resp.status_code != 200:
-                    return {"error": f"GitHub API error: {resp.status_code}", "repos": []}
-                
-                all_repos = resp.json()
-                mapped_repos = []
-                for r in all_repos:
-                    mapped_repos.append({
-                        "name": r["name"],
-                        "url": r["html_url"],
-                        "description": r.get("description", ""),
-                        "private": r.get("private", False),
-                        "default_branch": r.get("default_branch", "main"),
-                        "language": r.get("language"),
-                        "stars": r.get("stargazers_count", 0),
-                        "forks": r.get("forks_count", 0),
-                    })
-                github_cache.set(cache_key, mapped_repos)
-                all_repos = mapped_repos
-        except Exception as e:
-            return {"error": str(e), "repos": []}
-    else:
-        all_repos = cached_repos
+    if all_repos is None:
+        # Concurrent misses wait for one fetch instead of each calling GitHub
+        async with _fetch_lock(cache_key):
+            all_repos = github_cache.get(cache_key)
+            if all_repos is None:
+                try:
+                    all_repos = await _fetch_org_repos(org, token)
+                except Exception as e:
+                    return {"error": str(e), "repos": []}
+                github_cache.set(cache_key, all_repos)
 
     user_team = get_user_team(user["email"])
-    
+    repos = all_repos
+    if user.get("role") != "admin":
+        # Team patterns are compiled once per teams.yaml load; "*" skips matching
+        access = get_team_access(user_team, "repos")
+        if not access.wildcard:
+            repos = [r for r in all_repos if access.allows(r["name"])]
+
     return {
-        "repos": all_repos, 
+        "repos": repos,
         "org": org,
-        "total": len(all_repos),
+        "total": len(repos),
         "team_name": user_team,
         "all_count": len(all_repos)
     }
@@ -85,32 +243,24 @@ async def api_github_config(user: dict = Depends(require_auth)):
     github_config = config.get("github", {})
     return {"org": github_config.get("org", ""), "has_token": bool(github_config.get("token"))}
 
-@router.get("/repos/{owner}/{repo}/status")
-async def api_repo_status(owner: str, repo: str, user: dict = Depends(require_auth)):
-    """Get repository pipeline and commit status."""
-    config = get_github_config()
-    token = config.get("github", {}).get("token", "")
-    
-    cache_key = f"status:{owner}:{repo}"
-    cached = github_cache.get(cache_key)
-    if cached:
-        return cached
 
-    # Determine default branch
-    default_branch = "main"
-    try:
-        async with httpx.AsyncClient() as client:
-            headers = {"Accept": "application/vnd.github.v3+json"}
-            if token:
-                headers["Authorization"] = f"token {token}"
-            repo_resp = await client.get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers)
-            if repo_resp.status_code == 200:
-                default_branch = repo_resp.json().get("default_branch", "main")
-    except:
-        pass
+async def _fetch_repo_status(owner: str, repo: str, token: str) -> dict:
+    """Fetch a repository's latest pipeline run and head commit."""
+    # Workflow runs don't depend on the branch, so fetch them meanwhile
+    runs_task = asyncio.create_task(
+        asyncio.to_thread(get_workflow_runs, owner, repo, limit=1, token=token)
+    )
 
-    commit = get_latest_commit(owner, repo, default_branch, token)
-    success, runs = get_workflow_runs(owner, repo, limit=1, token=token)
+    # GraphQL needs a token; without one (or if it fails) fall back to REST
+    commit = None
+    if token:
+        try:
+            commit = await _get_head_commit_graphql(owner, repo, token)
+        except Exception:
+            pass
+    if commit is None:
+        commit = await _get_head_commit_rest(owner, repo, token)
+    success, runs = await runs_task
     
     pipeline = {"status": "no_runs", "conclusion": None, "html_url": "#"}
     if success and runs:
@@ -121,7 +271,7 @@ async def api_repo_status(owner: str, repo: str, user: dict = Depends(require_au
             "html_url": run["html_url"]
         }
 
-    response = {
+    return {
         "pipeline": pipeline,
         "commit": commit or {
             "message": "No commit data",
@@ -130,38 +280,52 @@ async def api_repo_status(owner: str, repo: str, user: dict = Depends(require_au
             "sha": "---"
         }
     }
-    
-    github_cache.set(cache_key, response, ttl=60)
-    return response
 
-@router.get("/repos/{owner}/{repo}/security-alerts")
-async def api_repo_security(owner: str, repo: str, user: dict = Depends(require_auth)):
-    """Get repository security alerts."""
+
+@router.get("/repos/{owner}/{repo}/status")
+async def api_repo_status(owner: str, repo: str, user: dict = Depends(require_auth)):
+    """Get repository pipeline and commit status."""
     config = get_github_config()
     token = config.get("github", {}).get("token", "")
     
-    cache_key = f"security:{owner}:{repo}"
+    cache_key = f"status:{owner}:{repo}"
     cached = github_cache.get(cache_key)
     if cached:
         return cached
 
-    dependabot = get_dependabot_alerts(owner, repo, token) or []
-    secrets = get_secret_scanning_alerts(owner, repo, token) or []
-    code = get_code_scanning_alerts(owner, repo, token) or []
+    async with _fetch_lock(cache_key):
+        cached = github_cache.get(cache_key)
+        if cached:
+            return cached
+        response = await _fetch_repo_status(owner, repo, token)
+        github_cache.set(cache_key, response, ttl=60)
+    return response
+
+
+async def _fetch_repo_security(owner: str, repo: str, token: str) -> dict:
+    """Fetch and summarize a repository's open security alerts."""
+    # The helpers block on requests; run the three lookups concurrently
+    results = await asyncio.gather(
+        asyncio.to_thread(get_dependabot_alerts, owner, repo, token),
+        asyncio.to_thread(get_secret_scanning_alerts, owner, repo, token),
+        asyncio.to_thread(get_code_scanning_alerts, owner, repo, token),
+        return_exceptions=True,
+    )
+    dependabot, secrets, code = (
+        [] if isinstance(alerts, Exception) or not alerts else alerts
+        for alerts in results
+    )
     
     # Calculate summary
-    critical = sum(1 for a in (dependabot + code) if a.get("severity") == "critical")
-    high = sum(1 for a in (dependabot + code) if a.get("severity") == "high")
-    medium = sum(1 for a in (dependabot + code) if a.get("severity") == "medium")
-    low = sum(1 for a in (dependabot + code) if a.get("severity") == "low")
+    severities = Counter(a.get("severity") for alerts in (dependabot, code) for a in alerts)
     
-    response = {
+    return {
         "summary": {
             "total": len(dependabot) + len(secrets) + len(code),
-            "critical": critical,
-            "high": high,
-            "medium": medium,
-            "low": low
+            "critical": severities["critical"],
+            "high": severities["high"],
+            "medium": severities["medium"],
+            "low": severities["low"]
         },
         "alerts": {
             "dependabot": dependabot,
@@ -169,6 +333,23 @@ async def api_repo_security(owner: str, repo: str, user: dict = Depends(require_
             "code_scanning": code
         }
     }
+
+
+@router.get("/repos/{owner}/{repo}/security-alerts")
+async def api_repo_security(owner: str, repo: str, user: dict = Depends(require_auth)):
+    """Get repository security alerts."""
+    config = get_github_config()
+    token = config.get("github", {}).get("token", "")
     
-    github_cache.set(cache_key, response, ttl=300)
+    cache_key = f"security:{owner}:{repo}"
+    cached = github_cache.get(cache_key)
+    if cached:
+        return cached
+
+    async with _fetch_lock(cache_key):
+        cached = github_cache.get(cache_key)
+        if cached:
+            return cached
+        response = await _fetch_repo_security(owner, repo, token)
+        github_cache.set(cache_key, response, ttl=300)
     return response
@@ -1,53 +1,61 @@
 """Meeting routes for the dashboard."""
 
-import copy
+import logging
+import re
 from fastapi import APIRouter, Depends
 from ..main import require_auth
 from devops_cli.config.manager import config_manager
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/meetings", tags=["meetings"])
 
+# "HH:MM" (24h) or "H:MM AM/PM" (12h); like strptime, single-digit
+# hours and minutes ("9:5") are accepted
+_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{1,2})\s*(AM|PM)?\s*$", re.IGNORECASE)
+# Meetings without a usable time are ranked last
+_END_OF_DAY = 23 * 60 + 59
+
+
+def _meeting_minutes(time_str) -> int:
+    """Get a meeting time as minutes since midnight, for ranking."""
+    match = _TIME_RE.match(str(time_str)) if time_str else None
+    if not match:
+        return _END_OF_DAY
+    hour, minute, meridiem = int(match[1]), int(match[2]), match[3]
+    if minute > 59:
+        return _END_OF_DAY
+    if meridiem:
+        # Handle 12h format if user provides it, though we expect 24h
+        if not 1 <= hour <= 12:
+            return _END_OF_DAY
+        hour = hour % 12 + (12 if meridiem.upper() == "PM" else 0)
+    elif hour > 23:
+        return _END_OF_DAY
+    return hour * 60 + minute
+
+
 @router.get("")
 async def get_meetings(user: dict = Depends(require_auth)):
     """Get all configured meetings, ranked by time."""
     try:
-        # Get raw data and deep copy to avoid modifying cache
         raw_config = config_manager.meetings
-        print(f"DEBUG: raw_config type: {type(raw_config)}")
-        print(f"DEBUG: raw_config content: {raw_config}")
-        
-        meetings_data = copy.deepcopy(raw_config.get("meetings", {}))
-        print(f"DEBUG: meetings_data: {meetings_data}")
+        logger.debug("raw_config content: %r", raw_config)
         
-        # Convert to list and add IDs
-        meetings_list = []
-        for m_id, m_data in meetings_data.items():
-            if isinstance(m_data, dict):
-                m_data["id"] = m_id
-                meetings_list.append(m_data)
+        # Convert to list and add IDs; shallow copies keep the cache untouched
+        meetings_list = [
+            {**m_data, "id": m_id}
+            for m_id, m_data in raw_config.get("meetings", {}).items()
+            if isinstance(m_data, dict)
+        ]
         
-        print(f"DEBUG: meetings_list before sort: {meetings_list}")
+        logger.debug("meetings_list before sort: %s", meetings_list)
         
         # Rank by time
-        def parse_time(time_str):
-            try:
-                if not time_str:
-                    return datetime.strptime("23:59", "%H:%M")
-                # Handle 12h format if user provides it, though we expect 24h
-                if 'AM' in str(time_str).upper() or 'PM' in str(time_str).upper():
-                    return datetime.strptime(str(time_str).upper(), "%I:%M %p")
-                return datetime.strptime(str(time_str), "%H:%M")
-            except Exception as e:
-                print(f"DEBUG: Error parsing time '{time_str}': {e}")
-                return datetime.strptime("23:59", "%H:%M")
-
-        meetings_list.sort(key=lambda x: parse_time(x.get("time", "00:00")))
-        print(f"DEBUG: meetings_list after sort: {meetings_list}")
+        meetings_list.sort(key=lambda x: _meeting_minutes(x.get("time", "00:00")))
+        logger.debug("meetings_list after sort: %s", meetings_list)
         
         return {"meetings": meetings_list}
     except Exception as e:
-        import traceback
-        print(f"DEBUG: Error in get_meetings: {e}")
-        print(traceback.format_exc())
+        logger.exception("Error in get_meetings: %s", e)
         return {"meetings": [], "error": str(e)}
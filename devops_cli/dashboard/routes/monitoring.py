@@ -1,94 +1,287 @@
 """Monitoring routes for the dashboard."""
 
+import logging
+import time
 import asyncio
-import json
+from collections import Counter
+from typing import Dict, Optional
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from ..main import require_auth, monitoring_cache
-from ..logic import filter_by_team_access
+from ..logic import get_user_team, get_team_access
+from ..utils import FastJSONResponse, json_dumps
+from devops_cli.monitoring import MonitoringConfig, HealthChecker
+from devops_cli.monitoring.checker import HealthResult, HealthStatus
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
 
+# Frontend status names; anything else is shown as degraded
+_STATUS_MAP = {HealthStatus.HEALTHY: "online", HealthStatus.UNHEALTHY: "offline"}
+
+
+def _result_to_dict(r) -> dict:
+    """Convert a HealthResult to the monitoring API representation."""
+    return {
+        "name": r.name,
+        "status": _STATUS_MAP.get(r.status, "degraded"),
+        "response_time": r.response_time_ms,
+        "message": r.message,
+        "details": r.details,
+        "checked_at": r.checked_at.isoformat(),
+    }
+
+
+def _summarize(results: dict) -> dict:
+    """Count result statuses across all resource groups in one pass."""
+    counts = Counter(r.status for group in results.values() for r in group)
+    total = sum(counts.values())
+    online = counts[HealthStatus.HEALTHY]
+    offline = counts[HealthStatus.UNHEALTHY]
+    degraded = counts[HealthStatus.DEGRADED]
+    return {
+        "online": online,
+        "offline": offline,
+        "degraded": degraded,
+        "unknown": total - online - offline - degraded,
+        "total": total,
+    }
+
+
+def _result_to_stream_dict(r) -> dict:
+    """Convert a HealthResult to the compact SSE representation."""
+    return {
+        "name": r.name,
+        "status": _STATUS_MAP.get(r.status, "degraded"),
+        "response_time": r.response_time_ms,
+    }
+
+
+def _filter_configs(configs: list, team: str, resource_type: str) -> list:
+    """Keep the monitoring configs a team may see."""
+    access = get_team_access(team, resource_type)
+    if access.wildcard:
+        return configs
+    return [c for c in configs if access.allows(c.name)]
+
+
+# Results are fresh for MONITORING_FRESH_SECONDS; after that they are still
+# served for MONITORING_STALE_SECONDS while one refresh runs in the background
+MONITORING_FRESH_SECONDS = 30
+MONITORING_STALE_SECONDS = 60
+_monitoring_locks: Dict[str, asyncio.Lock] = {}
+_monitoring_refreshes: Dict[str, asyncio.Task] = {}
+
+
+async def _compute_monitoring(team: Optional[str]) -> dict:
+    """Run the health checks visible to a team (all of them when None)."""
+    config = MonitoringConfig()
+    checker = HealthChecker()
+
+    websites_from_config = config.get_websites()
+    apps_from_config = config.get_apps()
+    servers_from_config = config.get_servers()
+
+    # Filter resources by team access (admin sees all); the configs are
+    # matched by name directly rather than round-tripped through dicts
+    if team is not None:
+        websites_from_config = _filter_configs(websites_from_config, team, "websites")
+        apps_from_config = _filter_configs(apps_from_config, team, "apps")
+        servers_from_config = _filter_configs(servers_from_config, team, "servers")
+
+    # Run health checks
+    results = await checker.check_all(
+        websites_from_config, apps_from_config, servers_from_config
+    )
+
+    # Prepare summary for frontend
+    frontend_summary = _summarize(results)
+
+    response_data = {
+        "websites": list(map(_result_to_dict, results["websites"])),
+        "apps": list(map(_result_to_dict, results["apps"])),
+        "servers": list(map(_result_to_dict, results["servers"])),
+        "summary": frontend_summary,
+    }
+    
+    logger.debug("api_monitoring returning summary: %s", frontend_summary)
+    return response_data
+
+
+async def _refresh_monitoring(cache_key: str, team: Optional[str]) -> bytes:
+    """Recompute monitoring results and store them, serialized, in the cache."""
+    data = await _compute_monitoring(team)
+    # Serialize once; every request served from the cache reuses the bytes
+    body = FastJSONResponse(data).body
+    monitoring_cache.set(
+        cache_key,
+        {"body": body, "computed_at": time.time()},
+        ttl=MONITORING_FRESH_SECONDS + MONITORING_STALE_SECONDS,
+    )
+    return body
+
+
+def _json_body(body: bytes) -> Response:
+    """Wrap pre-serialized JSON in a response."""
+    return Response(content=body, media_type="application/json")
+
+
+async def _refresh_monitoring_in_background(cache_key: str, team: Optional[str]):
+    """Refresh stale monitoring results, keeping the stale copy on failure."""
+    try:
+        await _refresh_monitoring(cache_key, team)
+    except Exception as e:
+        logger.warning("api_monitoring background refresh failed: %s", e)
+
+
 @router.get("")
 async def api_monitoring(user: dict = Depends(require_auth)):
     """Get monitoring status."""
-    # Check cache first
-    cached = monitoring_cache.get("status")
+    # Filtered results differ per team, so cache them per team
+    team = None if user.get("role") == "admin" else get_user_team(user["email"])
+    cache_key = "status" if team is None else f"status:team:{team}"
+
+    cached = monitoring_cache.get(cache_key)
     if cached:
-        return cached
+        # Serve stale results immediately and refresh them once in the background
+        if time.time() - cached["computed_at"] >= MONITORING_FRESH_SECONDS:
+            task = _monitoring_refreshes.get(cache_key)
+            if task is None or task.done():
+                _monitoring_refreshes[cache_key] = asyncio.create_task(
+                    _refresh_monitoring_in_background(cache_key, team)
+                )
+        return _json_body(cached["body"])
+
+    # Nothing to serve: concurrent misses wait for a single computation
+    lock = _monitoring_locks.setdefault(cache_key, asyncio.Lock())
+    async with lock:
+        cached = monitoring_cache.get(cache_key)
+        if cached:
+            return _json_body(cached["body"])
+        try:
+            return _json_body(await _refresh_monitoring(cache_key, team))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+# Shared state for the SSE stream: one refresher task runs the health checks
+# and every connected client reads the latest snapshot
+STREAM_INTERVAL_SECONDS = 10
+# Each check is bounded on its own, so one hung target is reported as
+# unknown instead of dropping the whole round. The cap sits above the
+# checker's own 10s HTTP timeouts; websites get their configured timeout
+# plus a little slack when that is longer.
+STREAM_CHECK_TIMEOUT_SECONDS = 15
+_stream_snapshot: Optional[str] = None
+_stream_ready: Optional[asyncio.Event] = None
+_stream_task: Optional[asyncio.Task] = None
+_stream_clients = 0
+
+
+async def _bounded_check(check, name: str, resource_type: str, timeout: float) -> HealthResult:
+    """Run one health check, reporting it as unknown if it overruns timeout."""
     try:
-        from devops_cli.monitoring import MonitoringConfig, HealthChecker
-        from devops_cli.monitoring.checker import HealthStatus
-        from devops_cli.monitoring.config import WebsiteConfig, AppConfig, ServerConfig
+        return await asyncio.wait_for(check, timeout=timeout)
+    except asyncio.TimeoutError:
+        return HealthResult(
+            name=name,
+            resource_type=resource_type,
+            status=HealthStatus.UNKNOWN,
+            message=f"Check timed out after {timeout:g}s",
+        )
+    except Exception as e:
+        return HealthResult(
+            name=name,
+            resource_type=resource_type,
+            status=HealthStatus.UNKNOWN,
+            message=f"Check failed: {type(e).__name__}",
+        )
 
-        config = MonitoringConfig()
-        checker = HealthChecker()
 
-        websites_from_config = config.get_websites()
-        apps_from_config = config.get_apps()
-        servers_from_config = config.get_servers()
+async def _check_stream_status(config: MonitoringConfig, checker: HealthChecker) -> dict:
+    """Run one round of health checks and build the stream payload."""
+    # Get resources (no filtering for stream for simplicity in this turn)
+    websites = config.get_websites()
+    apps = config.get_apps()
+    servers = config.get_servers()
 
-        # Filter resources by team access (admin sees all)
-        if user.get("role") != "admin":
-            websites_from_config = filter_by_team_access(
-                [w.as_dict() for w in websites_from_config], user["email"], "websites"
+    website_results, app_results, server_results = await asyncio.gather(
+        asyncio.gather(*(
+            _bounded_check(
+                checker.check_website(w), w.name, "website",
+                max(STREAM_CHECK_TIMEOUT_SECONDS, w.timeout + 5),
             )
-            websites_from_config = [WebsiteConfig(**w) for w in websites_from_config]
+            for w in websites
+        )),
+        asyncio.gather(*(
+            _bounded_check(checker.check_app(a), a.name, "app", STREAM_CHECK_TIMEOUT_SECONDS)
+            for a in apps
+        )),
+        asyncio.gather(*(
+            _bounded_check(checker.check_server(s), s.name, "server", STREAM_CHECK_TIMEOUT_SECONDS)
+            for s in servers
+        )),
+    )
+    results = {
+        "websites": list(website_results),
+        "apps": list(app_results),
+        "servers": list(server_results),
+    }
 
-            apps_from_config = filter_by_team_access(
-                [a.as_dict() for a in apps_from_config], user["email"], "apps"
-            )
-            apps_from_config = [AppConfig(**a) for a in apps_from_config]
+    summary = _summarize(results)
+    return {
+        "websites": list(map(_result_to_stream_dict, results["websites"])),
+        "apps": list(map(_result_to_stream_dict, results["apps"])),
+        "servers": list(map(_result_to_stream_dict, results["servers"])),
+        "summary": {
+            "online": summary["online"],
+            "offline": summary["offline"],
+            "total": summary["total"],
+        }
+    }
 
-            servers_from_config = filter_by_team_access(
-                [s.as_dict() for s in servers_from_config], user["email"], "servers"
-            )
-            servers_from_config = [ServerConfig(**s) for s in servers_from_config]
 
-        # Run health checks
-        results = await checker.check_all(
-            websites_from_config, apps_from_config, servers_from_config
-        )
+async def _refresh_stream_snapshot():
+    """Refresh the shared snapshot and wake waiting clients."""
+    global _stream_snapshot, _stream_ready
+    # Resources are re-read every round, but the checker (and its failure
+    # history) lives for as long as the stream does
+    config = MonitoringConfig()
+    checker = HealthChecker()
+    while True:
+        started = time.perf_counter()
+        try:
+            data = await _check_stream_status(config, checker)
+        except Exception as e:
+            data = {"error": str(e)}
+        # Serialize once here rather than once per connected client
+        _stream_snapshot = f"data: {json_dumps(data)}\n\n"
 
-        # Convert HealthResult objects to dictionaries
-        def result_to_dict(r):
-            return {
-                "name": r.name,
-                "status": (
-                    "online"
-                    if r.status == HealthStatus.HEALTHY
-                    else "offline" if r.status == HealthStatus.UNHEALTHY else "degraded"
-                ),
-                "response_time": r.response_time_ms,
-                "message": r.message,
-                "details": r.details,
-                "checked_at": r.checked_at.isoformat(),
-            }
-
-        # Prepare summary for frontend
-        summary = checker.get_summary()
-        frontend_summary = {
-            "online": summary.get("healthy", 0),
-            "offline": summary.get("unhealthy", 0),
-            "degraded": summary.get("degraded", 0),
-            "unknown": summary.get("unknown", 0),
-            "total": summary.get("total", 0)
-        }
+        ready, _stream_ready = _stream_ready, asyncio.Event()
+        ready.set()
+        # Keep a steady cadence however long the checks took
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(max(0, STREAM_INTERVAL_SECONDS - elapsed))
+
+
+def _subscribe_stream():
+    """Register a stream client, starting the refresher if needed."""
+    global _stream_clients, _stream_task, _stream_ready, _stream_snapshot
+    _stream_clients += 1
+    if _stream_task is None or _stream_task.done():
+        _stream_snapshot = None
+        _stream_ready = asyncio.Event()
+        _stream_task = asyncio.create_task(_refresh_stream_snapshot())
+
+
+def _unsubscribe_stream():
+    """Unregister a stream client, stopping the refresher when idle."""
+    global _stream_clients, _stream_task
+    _stream_clients -= 1
+    if _stream_clients == 0 and _stream_task is not None:
+        _stream_task.cancel()
+        _stream_task = None
 
-        response_data = {
-            "websites": [result_to_dict(r) for r in results["websites"]],
-            "apps": [result_to_dict(r) for r in results["apps"]],
-            "servers": [result_to_dict(r) for r in results["servers"]],
-            "summary": frontend_summary,
-        }
-        
-        print(f"DEBUG: api_monitoring returning summary: {frontend_summary}")
-        monitoring_cache.set("status", response_data)
-        return response_data
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/stream")
 async def api_monitoring_stream(request: Request):
@@ -98,52 +291,20 @@ async def api_monitoring_stream(request: Request):
     # For now, following original logic.
 
     async def status_generator():
-        while True:
-            if await request.is_disconnected():
-                break
-
-            try:
-                from devops_cli.monitoring import MonitoringConfig, HealthChecker
-                from devops_cli.monitoring.checker import HealthStatus
-                from devops_cli.monitoring.config import WebsiteConfig, AppConfig, ServerConfig
-
-                config = MonitoringConfig()
-                checker = HealthChecker()
-
-                # Get resources (no filtering for stream for simplicity in this turn)
-                websites = config.get_websites()
-                apps = config.get_apps()
-                servers = config.get_servers()
-
-                results = await checker.check_all(websites, apps, servers)
-
-                def result_to_dict(r):
-                    return {
-                        "name": r.name,
-                        "status": (
-                            "online"
-                            if r.status == HealthStatus.HEALTHY
-                            else "offline" if r.status == HealthStatus.UNHEALTHY else "degraded"
-                        ),
-                        "response_time": r.response_time_ms,
-                    }
-
-                summary = checker.get_summary()
-                data = {
-                    "websites": [result_to_dict(r) for r in results["websites"]],
-                    "apps": [result_to_dict(r) for r in results["apps"]],
-                    "servers": [result_to_dict(r) for r in results["servers"]],
-                    "summary": {
-                        "online": summary.get("healthy", 0),
-                        "offline": summary.get("unhealthy", 0),
-                        "total": summary.get("total", 0)
-                    }
-                }
-
-                yield f"data: {json.dumps(data)}\n\n"
-            except Exception as e:
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-            await asyncio.sleep(10)  # Update every 10 seconds
+        _subscribe_stream()
+        try:
+            last_sent = None
+            while True:
+                if await request.is_disconnected():
+                    break
+
+                if _stream_snapshot is None or _stream_snapshot is last_sent:
+                    await _stream_ready.wait()
+                    continue
+
+                last_sent = _stream_snapshot
+                yield last_sent
+        finally:
+            _unsubscribe_stream()
 
     return StreamingResponse(status_generator(), media_type="text/event-stream")
@@ -1,6 +1,7 @@
 """Security routes for the dashboard."""
 
 import asyncio
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from fastapi import APIRouter, Request, HTTPException, Depends
@@ -10,7 +11,9 @@ from devops_cli.utils.security_scanner import run_local_scan
 
 router = APIRouter(prefix="/api/security", tags=["security"])
 
-security_events = []
+# Newest first; the oldest event drops off once 50 are held
+MAX_SECURITY_EVENTS = 50
+security_events = deque(maxlen=MAX_SECURITY_EVENTS)
 
 @router.post("/webhooks/github")
 async def github_security_webhook(request: Request):
@@ -26,11 +29,10 @@ async def github_security_webhook(request: Request):
         "alert": data.get("alert"),
     }
 
-    security_events.insert(0, event)
-    if len(security_events) > 50:
-        security_events.pop()
+    security_events.appendleft(event)
 
-    log_activity(
+    await asyncio.to_thread(
+        log_activity,
         "alert",
         "github-webhook",
         f"Security Alert: {event_type} {data.get('action')} in {event['repo']}",
@@ -41,7 +43,7 @@ async def github_security_webhook(request: Request):
 @router.get("/events")
 async def api_security_events(user: dict = Depends(require_auth)):
     """Get recent security webhook events."""
-    return {"events": security_events}
+    return {"events": list(security_events)}
 
 @router.get("/local-scan")
 async def api_local_security_scan(path: str = ".", user: dict = Depends(require_auth)):
@@ -3,15 +3,15 @@
 import asyncio
 from fastapi import APIRouter, Request, HTTPException, Depends
 from ..main import require_auth
-from ..logic import filter_by_team_access, get_user_team, get_team_permissions, can_access_resource, log_activity
+from ..logic import filter_by_team_access, get_user_team, get_team_access, DENY_ALL, log_activity
+from devops_cli.commands.admin import load_servers_config
+from devops_cli.commands.ssh import get_server_config, run_remote_command
 
 router = APIRouter(prefix="/api/servers", tags=["servers"])
 
 @router.get("")
 async def api_servers(user: dict = Depends(require_auth)):
     """Get all servers (filtered by team access)."""
-    from devops_cli.commands.admin import load_servers_config
-
     try:
         config = load_servers_config()
         servers = config.get("servers", {})
@@ -42,8 +42,6 @@ async def api_server_exec(
     server_name: str, request: Request, user: dict = Depends(require_auth)
 ):
     """Execute a command on a server via SSH."""
-    from devops_cli.commands.ssh import get_server_config, run_remote_command
-
     data = await request.json()
     command = data.get("command")
 
@@ -52,9 +50,9 @@ async def api_server_exec(
 
     # Check team access
     if user.get("role") != "admin":
-        team = get_user_team(user["email"])
-        permissions = get_team_permissions(team)
-        if not can_access_resource(server_name, permissions.get("servers", [])):
+        # Teams that don't list servers get no shell access
+        access = get_team_access(get_user_team(user["email"]), "servers", missing=DENY_ALL)
+        if not access.allows(server_name):
             raise HTTPException(status_code=403, detail="No access to this server")
 
     config = get_server_config(server_name)
@@ -67,7 +65,8 @@ async def api_server_exec(
     )
 
     # Log to system activity
-    log_activity(
+    await asyncio.to_thread(
+        log_activity,
         "server",
         user["email"],
         f"Executed '{command[:30]}...' on {server_name}",
@@ -1,5 +1,6 @@
 """User management routes for the dashboard."""
 
+import asyncio
 from fastapi import APIRouter, Request, HTTPException, Depends
 from ..main import require_admin, require_auth, auth_manager
 from ..logic import log_activity
@@ -42,7 +43,7 @@ async def api_add_user(user_data: dict, current_user: dict = Depends(require_adm
 
     try:
         token = auth_manager.register_user(email, name, role, team)
-        log_activity("user", current_user["email"], f"Registered user: {email}")
+        await asyncio.to_thread(log_activity, "user", current_user["email"], f"Registered user: {email}")
         return {"success": True, "token": token}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -56,7 +57,7 @@ async def api_remove_user(email: str, current_user: dict = Depends(require_admin
         raise HTTPException(status_code=400, detail="Cannot remove yourself")
 
     if auth_manager.remove_user(email):
-        log_activity("user", current_user["email"], f"Removed user: {email}")
+        await asyncio.to_thread(log_activity, "user", current_user["email"], f"Removed user: {email}")
         return {"success": True}
     else:
         raise HTTPException(status_code=404, detail="User not found")
@@ -3,14 +3,13 @@
 from fastapi import APIRouter, Depends
 from ..main import require_auth
 from ..logic import filter_by_team_access
+from devops_cli.config.websites import load_websites_config
 
 router = APIRouter(prefix="/api/websites", tags=["websites"])
 
 @router.get("")
 async def api_websites(user: dict = Depends(require_auth)):
     """Get all websites (filtered by team access)."""
-    from devops_cli.config.websites import load_websites_config
-
     try:
         websites = load_websites_config()
 
@@ -1,38 +1,89 @@
 "Core services for the dashboard."
 
-import json
+import logging
+import heapq
+import asyncio
+import itertools
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
-from devops_cli.utils.log_formatters import mask_secrets
+from devops_cli.utils.aws_helpers import get_aws_session
+from devops_cli.utils.file_cache import SignatureCache, file_signature
+from devops_cli.utils.log_formatters import detect_log_level, mask_secrets
+from .utils import TTLCache, json_loads
+
+try:
+    from botocore.exceptions import ClientError
+
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path.home() / ".devops-cli"
 DOCUMENTS_DIR = CONFIG_DIR / "documents"
+DOCUMENT_LOG_LINES = 100
+# Upper bound on lines scanned to fill DOCUMENT_LOG_LINES entries
+DOCUMENT_SCAN_LINES = 1000
+
+# CloudWatch Logs clients keyed by (aws_role, region). Assumed-role
+# credentials last an hour, so rebuild clients well before they expire.
+LOGS_CLIENT_TTL = 45 * 60
+_logs_clients = TTLCache(default_ttl=LOGS_CLIENT_TTL, max_entries=32)
+
+# Parsed documents metadata, keyed by the metadata file's signature
+_documents_metadata_cache: SignatureCache[dict] = SignatureCache()
 
 def get_documents_metadata() -> dict:
-    """Get metadata for uploaded documents."""
+    """Get metadata for uploaded documents, re-reading only when the file changes."""
     metadata_file = DOCUMENTS_DIR / "metadata.json"
-    if metadata_file.exists():
-        try:
-            with open(metadata_file) as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {"documents": {}}
-
-async def fetch_cloudwatch_logs(log_group: str, region: str, lines: int = 100, aws_role: str = None) -> dict:
-    """Fetch logs from AWS CloudWatch using the correct session."""
+    signature = file_signature(metadata_file)
+    if signature is None:
+        return {"documents": {}}
+
+    metadata = _documents_metadata_cache.get(signature)
+    if metadata is not None:
+        return metadata
     try:
-        from devops_cli.utils.aws_helpers import get_aws_session
-        from botocore.exceptions import ClientError
+        with open(metadata_file, "rb") as f:
+            metadata = json_loads(f.read())
+    except Exception:
+        return {"documents": {}}
+    return _documents_metadata_cache.set(signature, metadata)
+
+async def get_logs_client(region: str, aws_role: str = None):
+    """Get a CloudWatch Logs client, reusing one built for the same role and region."""
+    key = (aws_role, region)
+    client = _logs_clients.get(key)
+    if client is None:
+        def build():
+            session = get_aws_session(role_name=aws_role, region=region)
+            return session.client("logs")
+
+        # Role assumption and client construction block, so build in a thread
+        client = await asyncio.to_thread(build)
+        _logs_clients.set(key, client)
+    return client
+
+async def fetch_cloudwatch_logs(
+    log_group: str, region: str, lines: int = 100, aws_role: str = None, level_filter: str = None
+) -> dict:
+    """Fetch logs from AWS CloudWatch using the correct session.
+
+    Only entries at level_filter (e.g. "ERROR") are returned when it is given.
+    """
+    if not BOTO3_AVAILABLE:
+        return {"success": False, "error": "boto3 is not installed. Run: pip install boto3"}
 
-        # Use our helper to get a session (handles roles and stored credentials)
-        session = get_aws_session(role_name=aws_role, region=region)
-        client = session.client("logs")
+    try:
+        # Every boto3 call blocks, so run them in threads
+        client = await get_logs_client(region, aws_role)
 
         # Get log streams
         try:
-            streams_response = client.describe_log_streams(
+            streams_response = await asyncio.to_thread(
+                client.describe_log_streams,
                 logGroupName=log_group, orderBy="LastEventTime", descending=True, limit=5
             )
         except ClientError as e:
@@ -46,39 +97,60 @@ async def fetch_cloudwatch_logs(log_group: str, region: str, lines: int = 100, a
         if not streams:
             return {"success": True, "logs": [], "source": "cloudwatch", "message": "No log streams found in this group"}
 
-        for stream in streams:
-            try:
-                events_response = client.get_log_events(
+        # Fetch all streams concurrently; boto3 is blocking, so each call
+        # runs in a worker thread
+        per_stream = max(1, lines // len(streams))
+        responses = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    client.get_log_events,
                     logGroupName=log_group,
                     logStreamName=stream["logStreamName"],
-                    limit=max(1, lines // len(streams)),
+                    limit=per_stream,
                     startFromHead=False,
                 )
+                for stream in streams
+            ),
+            return_exceptions=True,
+        )
+
+        per_stream_events = []
+        for stream, events_response in zip(streams, responses):
+            if isinstance(events_response, Exception):
+                logger.warning("Error fetching from stream %s: %s", stream["logStreamName"], events_response)
+                continue
+            name = stream["logStreamName"]
+            per_stream_events.append(
+                [(event, name) for event in events_response.get("events", [])]
+            )
 
-                for event in events_response.get("events", []):
-                    message = event.get("message", "")
-                    level = "INFO"
-                    if "ERROR" in message.upper(): level = "ERROR"
-                    elif "WARN" in message.upper(): level = "WARN"
-
-                    logs.append({
-                        "timestamp": datetime.fromtimestamp(event["timestamp"] / 1000).isoformat(),
-                        "level": level,
-                        "message": mask_secrets(message),
-                        "source": stream["logStreamName"],
-                    })
-            except Exception as stream_err:
-                print(f"DEBUG: Error fetching from stream {stream['logStreamName']}: {stream_err}")
-
-        logs.sort(key=lambda x: x["timestamp"], reverse=True)
-        return {"success": True, "logs": logs[:lines], "source": "cloudwatch"}
+        # Each stream is already in time order, so merge instead of sorting
+        merged = list(heapq.merge(*per_stream_events, key=lambda pair: pair[0]["timestamp"]))
+        for event, source in reversed(merged):
+            if len(logs) >= lines:
+                break
+            message = event.get("message", "")
+            level = detect_log_level(message)
+            if level_filter and level != level_filter:
+                continue
+            logs.append({
+                "timestamp": datetime.fromtimestamp(event["timestamp"] / 1000).isoformat(),
+                "level": level,
+                "message": mask_secrets(message),
+                "source": source,
+            })
+
+        return {"success": True, "logs": logs, "source": "cloudwatch"}
 
     except Exception as e:
-        print(f"DEBUG: fetch_cloudwatch_logs failed: {e}")
+        logger.warning("fetch_cloudwatch_logs failed: %s", e)
         return {"success": False, "error": str(e)}
 
-def get_document_logs(app_name: str) -> dict:
-    """Get logs from uploaded document."""
+def get_document_logs(app_name: str, level_filter: str = None) -> dict:
+    """Get logs from uploaded document.
+
+    Only entries at level_filter (e.g. "ERROR") are returned when it is given.
+    """
     metadata = get_documents_metadata()
     doc_info = metadata.get("documents", {}).get(app_name)
 
@@ -86,22 +158,25 @@ def get_document_logs(app_name: str) -> dict:
         return {"success": False, "error": "No document uploaded"}
 
     doc_path = DOCUMENTS_DIR / doc_info.get("filename", "")
-    if not doc_path.exists():
-        return {"success": False, "error": "Document file not found"}
-
     try:
-        with open(doc_path, "r", errors="ignore") as f:
-            text = f.read()
-
         logs = []
-        for line in text.split("\n")[:100]:
-            if line.strip():
-                level = "INFO"
-                if "error" in line.lower():
-                    level = "ERROR"
+        # Document lines carry no timestamps; stamp the whole batch once
+        read_at = datetime.now().isoformat()
+        # Read lazily and stop once enough entries are collected, so blank
+        # or filtered-out lines don't shrink the preview
+        with open(doc_path, "r", errors="ignore") as f:
+            for line in itertools.islice(f, DOCUMENT_SCAN_LINES):
+                if len(logs) >= DOCUMENT_LOG_LINES:
+                    break
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                level = detect_log_level(line)
+                if level_filter and level != level_filter:
+                    continue
                 logs.append(
                     {
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": read_at,
                         "level": level,
                         "message": mask_secrets(line),
                         "source": "document",
@@ -114,5 +189,7 @@ def get_document_logs(app_name: str) -> dict:
             "source": "document",
             "document_info": doc_info,
         }
+    except (FileNotFoundError, IsADirectoryError):
+        return {"success": False, "error": "Document file not found"}
     except Exception as e:
         return {"success": False, "error": str(e)}
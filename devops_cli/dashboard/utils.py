@@ -1,25 +1,83 @@
 """Utility classes for the dashboard."""
 
+import heapq
+import itertools
+import json
+import threading
 import time
-from typing import Optional, List
-from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict, deque
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed.
+
+    With indent, output is pretty-printed with two-space indentation.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
 
 class RateLimiter:
     """Simple in-memory rate limiter for authentication endpoints."""
 
+    __slots__ = ("max_attempts", "window_seconds", "_attempts")
+
     def __init__(self, max_attempts: int = 5, window_seconds: int = 300):
         self.max_attempts = max_attempts
         self.window_seconds = window_seconds
-        self._attempts: dict = defaultdict(list)
+        self._attempts: dict = defaultdict(deque)
 
     def is_rate_limited(self, key: str) -> bool:
         """Check if key (IP or email) is rate limited."""
-        now = time.time()
-        # Clean old attempts
-        self._attempts[key] = [
-            t for t in self._attempts[key] if now - t < self.window_seconds
-        ]
-        return len(self._attempts[key]) >= self.max_attempts
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return False
+        cutoff = time.time() - self.window_seconds
+        # Attempts are appended in time order, so old ones sit at the head
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
+        if not attempts:
+            # Forget keys with no recent attempts so the table doesn't grow
+            del self._attempts[key]
+            return False
+        return len(attempts) >= self.max_attempts
 
     def record_attempt(self, key: str):
         """Record an authentication attempt."""
@@ -27,51 +85,179 @@ class RateLimiter:
 
     def reset(self, key: str):
         """Reset attempts for a key (on successful login)."""
-        self._attempts[key] = []
+        self._attempts.pop(key, None)
 
     def get_remaining_time(self, key: str) -> int:
         """Get seconds until rate limit resets."""
-        if not self._attempts[key]:
+        attempts = self._attempts.get(key)
+        if not attempts:
             return 0
-        oldest = min(self._attempts[key])
-        return max(0, int(self.window_seconds - (time.time() - oldest)))
+        return max(0, int(self.window_seconds - (time.time() - attempts[0])))
 
 
 class TTLCache:
-    """Simple time-to-live cache for API responses."""
+    """Simple time-to-live cache for API responses.
 
-    def __init__(self, default_ttl: int = 300):
+    Safe to share between the event loop and threadpool workers: lookups
+    are single dict operations, and every heap mutation holds ``_lock``.
+    """
+
+    def __init__(self, default_ttl: int = 300, max_entries: Optional[int] = None):
         self.default_ttl = default_ttl
-        self._cache: dict = {}
-        self._timestamps: dict = {}
+        self.max_entries = max_entries
+        # key -> (value, expires_at)
+        self._cache: Dict[str, Tuple[Any, float]] = {}
+        # Min-heap of (expires_at, seq, key); entries whose expiry no longer
+        # matches the cached one are stale and skipped when popped. The
+        # sequence number breaks ties so keys themselves are never compared.
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
 
     def get(self, key: str) -> Optional[dict]:
         """Get value from cache if not expired."""
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
-        if time.time() - self._timestamps.get(key, 0) > self.default_ttl:
-            self.delete(key)
+        if entry[1] <= time.monotonic():
+            # Sessions are read from threadpool workers; another thread may
+            # have dropped the entry already
+            self._cache.pop(key, None)
             return None
-        return self._cache[key]
+        return entry[0]
 
     def set(self, key: str, value: dict, ttl: Optional[int] = None):
         """Set value in cache with optional custom TTL."""
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
+        now = time.monotonic()
+        expires_at = now + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            if (
+                self.max_entries is not None
+                and key not in self._cache
+                and len(self._cache) >= self.max_entries
+            ):
+                self._evict(now)
+            self._cache[key] = (value, expires_at)
+            heapq.heappush(self._heap, (expires_at, next(self._seq), key))
+            # Re-setting a key leaves its old heap entry behind; drop expired
+            # heads and rebuild once stale entries outnumber live ones, so the
+            # heap stays bounded even for caches that are never cleaned up.
+            self._expire(now)
+            if len(self._heap) > 2 * len(self._cache):
+                self._rebuild_heap()
 
     def delete(self, key: str):
         """Delete key from cache."""
         self._cache.pop(key, None)
-        self._timestamps.pop(key, None)
+
+    def pop(self, key: str) -> Optional[dict]:
+        """Remove a key and return its value if it had not expired."""
+        entry = self._cache.pop(key, None)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
 
     def clear(self):
         """Clear entire cache."""
-        self._cache.clear()
-        self._timestamps.clear()
+        with self._lock:
+            self._cache.clear()
+            self._heap.clear()
 
     def cleanup(self):
         """Remove expired entries."""
-        now = time.time()
-        expired = [k for k, t in self._timestamps.items() if now - t > self.default_ttl]
-        for key in expired:
-            self.delete(key)
+        with self._lock:
+            self._expire(time.monotonic())
+
+    def _expire(self, now: float):
+        """Pop heap entries that expired by now, dropping live ones from the cache.
+
+        Callers hold ``_lock``.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._cache.pop(key, None)
+
+    def _rebuild_heap(self):
+        """Rebuild the heap from live entries, discarding stale ones.
+
+        Callers hold ``_lock``.
+        """
+        seq = self._seq
+        # Snapshot the items: get() may drop expired keys from other threads
+        live = tuple(self._cache.items())
+        self._heap = [(entry[1], next(seq), key) for key, entry in live]
+        heapq.heapify(self._heap)
+
+    def _evict(self, now: float):
+        """Make room by dropping expired entries, else the soonest to expire.
+
+        Callers hold ``_lock``.
+        """
+        self._expire(now)
+        heap = self._heap
+        while len(self._cache) >= self.max_entries and heap:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._cache.pop(key, None)
+
+
+class RedisSessionStore:
+    """Session storage in Redis, shared by every dashboard worker.
+
+    Mirrors the TTLCache interface used for in-memory sessions; Redis
+    expires keys itself, so cleanup is a no-op.
+    """
+
+    def __init__(self, url: str, default_ttl: int, prefix: str = "devops-cli:session:"):
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        # GETDEL needs Redis 6.2+; flips off the first time the server rejects it
+        self._getdel_supported = True
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get a session if it exists and has not expired."""
+        data = self._client.get(self.prefix + key)
+        return json_loads(data) if data is not None else None
+
+    def set(self, key: str, value: dict, ttl: Optional[int] = None):
+        """Store a session with optional custom TTL."""
+        self._client.set(
+            self.prefix + key,
+            json_dumps(value),
+            ex=ttl if ttl is not None else self.default_ttl,
+        )
+
+    def delete(self, key: str):
+        """Delete a session."""
+        self._client.delete(self.prefix + key)
+
+    def pop(self, key: str) -> Optional[dict]:
+        """Delete a session and return it, in one round trip.
+
+        Servers older than Redis 6.2 lack GETDEL, so a GET and DEL are sent
+        together in a MULTI/EXEC transaction instead.
+        """
+        name = self.prefix + key
+        if self._getdel_supported:
+            try:
+                data = self._client.getdel(name)
+            except redis.exceptions.ResponseError as e:
+                if "unknown command" not in str(e).lower():
+                    raise
+                self._getdel_supported = False
+            else:
+                return json_loads(data) if data is not None else None
+
+        pipe = self._client.pipeline(transaction=True)
+        pipe.get(name)
+        pipe.delete(name)
+        data, _ = pipe.execute()
+        return json_loads(data) if data is not None else None
+
+    def cleanup(self):
+        """Expired sessions are dropped by Redis."""
@@ -520,8 +520,8 @@ class HealthChecker:
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
+            async with self._http_pool.session() as client:
+                response = await client.get(url, timeout=10, follow_redirects=False)
                 response_time = (time.time() - start_time) * 1000
 
                 if response.status_code == 200:
@@ -750,8 +750,8 @@ class HealthChecker:
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
+            async with self._http_pool.session() as client:
+                response = await client.get(url, timeout=10, follow_redirects=False)
                 response_time = (time.time() - start_time) * 1000
 
                 if response.status_code < 500:
@@ -0,0 +1,53 @@
+"""Helpers for caching data derived from files on disk."""
+
+from pathlib import Path
+from typing import Any, Generic, Optional, Tuple, TypeVar
+
+import yaml
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+T = TypeVar("T")
+
+
+def file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+    """Get a file's (mtime_ns, size), or None if it does not exist.
+
+    Size catches rewrites that land within the filesystem's mtime granularity.
+    """
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SignatureCache(Generic[T]):
+    """A single value remembered alongside the signature it was built from.
+
+    The signature is usually one or more file signatures, or the config
+    object a derived view was computed from. The entry is replaced as one
+    tuple, so readers in other threads never see a mismatched pair.
+    """
+
+    __slots__ = ("_entry",)
+
+    def __init__(self):
+        self._entry: Optional[Tuple[Any, T]] = None
+
+    def get(self, signature: Any) -> Optional[T]:
+        """Get the cached value if it was built from this signature."""
+        entry = self._entry
+        if entry is not None and (entry[0] is signature or entry[0] == signature):
+            return entry[1]
+        return None
+
+    def set(self, signature: Any, value: T) -> T:
+        """Remember a value for a signature and return it."""
+        self._entry = (signature, value)
+        return value
+
+    def clear(self):
+        """Forget the cached value."""
+        self._entry = None
@@ -7,6 +7,10 @@ import requests
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
+# Shared session so repeated API calls reuse pooled keep-alive connections
+# instead of a new TCP/TLS handshake each time
+_session = requests.Session()
+
 
 def get_headers(token: str) -> dict:
     """Get GitHub API headers."""
@@ -30,7 +34,7 @@ def get_latest_commit(owner: str, repo: str, branch: str, token: str) -> Optiona
     url = f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
 
     try:
-        resp = requests.get(url, headers=get_headers(token), timeout=10)
+        resp = _session.get(url, headers=get_headers(token), timeout=10)
 
         if resp.status_code == 200:
             data = resp.json()
@@ -68,7 +72,7 @@ def get_workflow_runs(
         params["branch"] = branch
 
     try:
-        resp = requests.get(url, params=params, headers=get_headers(token), timeout=15)
+        resp = _session.get(url, params=params, headers=get_headers(token), timeout=15)
 
         if resp.status_code == 200:
             runs = resp.json().get("workflow_runs", [])
@@ -116,7 +120,7 @@ def get_workflow_jobs(
     url = f"https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}/jobs"
 
     try:
-        resp = requests.get(url, headers=get_headers(token), timeout=10)
+        resp = _session.get(url, headers=get_headers(token), timeout=10)
 
         if resp.status_code == 200:
             jobs = resp.json().get("jobs", [])
@@ -276,7 +280,7 @@ def get_dependabot_alerts(
     params = {"state": state, "per_page": limit}
 
     try:
-        resp = requests.get(url, params=params, headers=get_headers(token), timeout=10)
+        resp = _session.get(url, params=params, headers=get_headers(token), timeout=10)
         if resp.status_code == 200:
             alerts = resp.json()
             simplified = []
@@ -320,7 +324,7 @@ def get_secret_scanning_alerts(
     params = {"state": state, "per_page": limit}
 
     try:
-        resp = requests.get(url, params=params, headers=get_headers(token), timeout=10)
+        resp = _session.get(url, params=params, headers=get_headers(token), timeout=10)
         if resp.status_code == 200:
             alerts = resp.json()
             simplified = []
@@ -359,7 +363,7 @@ def get_code_scanning_alerts(
     params = {"state": state, "per_page": limit}
 
     try:
-        resp = requests.get(url, params=params, headers=get_headers(token), timeout=10)
+        resp = _session.get(url, params=params, headers=get_headers(token), timeout=10)
         if resp.status_code == 200:
             alerts = resp.json()
             simplified = []
@@ -17,6 +17,28 @@ SECRET_PATTERNS = [
     r"gh[oprs]_[A-Za-z0-9]{36,}",
 ]
 
+# Substring level markers used when classifying raw log lines
+_ERROR_MARKER = re.compile("ERROR", re.IGNORECASE)
+_WARN_MARKER = re.compile("WARN", re.IGNORECASE)
+
+
+def detect_log_level(message: str) -> str:
+    """Classify a raw log line as ERROR, WARN or INFO.
+
+    ERROR wins over WARN when both appear anywhere in the message.
+
+    Args:
+        message: Raw log message
+
+    Returns:
+        Log level name
+    """
+    if _ERROR_MARKER.search(message):
+        return "ERROR"
+    if _WARN_MARKER.search(message):
+        return "WARN"
+    return "INFO"
+
 
 def mask_secrets(message: str) -> str:
     """Mask sensitive information in a string.
@@ -58,3 +58,27 @@ class TestConfig:
 
             assert loaded["github"]["token"] == "test-token"
             assert loaded["servers"]["test-server"]["host"] == "test.com"
+
+
+class TestConfigManagerReload:
+    """Test ConfigManager cache invalidation."""
+
+    def test_auto_reload_picks_up_changes(self, tmp_path, monkeypatch):
+        """Test an edited file is re-read once auto-reload is enabled."""
+        import os
+        from devops_cli.config.manager import ConfigManager
+
+        monkeypatch.setenv("DEVOPS_CONFIG_DIR", str(tmp_path))
+        manager = ConfigManager()
+        apps_file = tmp_path / "apps.yaml"
+        apps_file.write_text("apps:\n  api: {}\n")
+        assert list(manager.apps["apps"]) == ["api"]
+
+        apps_file.write_text("apps:\n  web: {}\n")
+        stat = apps_file.stat()
+        os.utime(apps_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        # Without auto-reload the cached copy is kept
+        assert list(manager.apps["apps"]) == ["api"]
+
+        manager.set_auto_reload(True)
+        assert list(manager.apps["apps"]) == ["web"]
@@ -0,0 +1,1013 @@
+"""Tests for dashboard utilities."""
+
+import pytest
+from devops_cli.dashboard import logic
+from devops_cli.dashboard.logic import can_access_resource
+from devops_cli.dashboard.utils import RateLimiter, TTLCache
+from devops_cli.utils.file_cache import SignatureCache
+
+
+def use_teams_file(monkeypatch, teams_file):
+    """Point the shared config manager at a test teams.yaml."""
+    from devops_cli.config.manager import config_manager
+
+    monkeypatch.setitem(config_manager.CONFIG_FILES, "teams", teams_file)
+    monkeypatch.setattr(config_manager, "_cache", {})
+
+
+class TestRateLimiter:
+    """Test the in-memory rate limiter."""
+
+    def test_not_limited_below_max(self):
+        """Test that attempts below the limit are allowed."""
+        limiter = RateLimiter(max_attempts=3, window_seconds=60)
+        limiter.record_attempt("1.2.3.4")
+        limiter.record_attempt("1.2.3.4")
+        assert limiter.is_rate_limited("1.2.3.4") is False
+
+    def test_limited_at_max(self):
+        """Test that reaching the limit blocks the key."""
+        limiter = RateLimiter(max_attempts=2, window_seconds=60)
+        limiter.record_attempt("user@example.com")
+        limiter.record_attempt("user@example.com")
+        assert limiter.is_rate_limited("user@example.com") is True
+        assert limiter.get_remaining_time("user@example.com") > 0
+
+    def test_old_attempts_expire(self, monkeypatch):
+        """Test that attempts outside the window are pruned."""
+        limiter = RateLimiter(max_attempts=1, window_seconds=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.time", lambda: 1000.0)
+        limiter.record_attempt("key")
+        assert limiter.is_rate_limited("key") is True
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.time", lambda: 1011.0)
+        assert limiter.is_rate_limited("key") is False
+        assert limiter.get_remaining_time("key") == 0
+
+    def test_reset(self):
+        """Test resetting a key clears its attempts."""
+        limiter = RateLimiter(max_attempts=1, window_seconds=60)
+        limiter.record_attempt("key")
+        limiter.reset("key")
+        assert limiter.is_rate_limited("key") is False
+
+    def test_idle_keys_are_forgotten(self, monkeypatch):
+        """Test keys are dropped once checked with no attempts in the window."""
+        limiter = RateLimiter(max_attempts=2, window_seconds=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.time", lambda: 1000.0)
+        assert limiter.is_rate_limited("never-seen") is False
+        limiter.record_attempt("key")
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.time", lambda: 1011.0)
+        assert limiter.is_rate_limited("key") is False
+        assert limiter._attempts == {}
+
+
+class TestTTLCache:
+    """Test the time-to-live cache."""
+
+    def test_set_and_get(self):
+        """Test a fresh entry is returned."""
+        cache = TTLCache(default_ttl=60)
+        cache.set("status", {"ok": True})
+        assert cache.get("status") == {"ok": True}
+
+    def test_missing_key(self):
+        """Test a missing key returns None."""
+        cache = TTLCache(default_ttl=60)
+        assert cache.get("missing") is None
+
+    def test_cleanup_removes_only_expired(self, monkeypatch):
+        """Test cleanup evicts expired entries and keeps fresh ones."""
+        cache = TTLCache(default_ttl=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set("old", {"v": 1})
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1008.0)
+        cache.set("new", {"v": 2})
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1011.0)
+        cache.cleanup()
+        assert cache.get("old") is None
+        assert cache.get("new") == {"v": 2}
+
+    def test_cleanup_skips_refreshed_entries(self, monkeypatch):
+        """Test re-setting a key keeps it alive past its first expiry."""
+        cache = TTLCache(default_ttl=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set("key", {"v": 1})
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1008.0)
+        cache.set("key", {"v": 2})
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1011.0)
+        cache.cleanup()
+        assert cache.get("key") == {"v": 2}
+
+    def test_per_entry_ttl(self, monkeypatch):
+        """Test a custom TTL passed to set overrides the default."""
+        cache = TTLCache(default_ttl=300)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set("short", {"v": 1}, ttl=5)
+        cache.set("long", {"v": 2})
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1006.0)
+        assert cache.get("short") is None
+        assert cache.get("long") == {"v": 2}
+
+    def test_max_entries_evicts_soonest_expiring(self):
+        """Test a full cache drops the entry closest to expiry."""
+        cache = TTLCache(default_ttl=60, max_entries=2)
+        cache.set("a", {"v": 1}, ttl=10)
+        cache.set("b", {"v": 2})
+        cache.set("c", {"v": 3})
+        assert cache.get("a") is None
+        assert cache.get("b") == {"v": 2}
+        assert cache.get("c") == {"v": 3}
+
+    def test_pop(self, monkeypatch):
+        """Test pop returns live values once and ignores expired ones."""
+        cache = TTLCache(default_ttl=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set("live", {"v": 1})
+        cache.set("old", {"v": 2}, ttl=1)
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1005.0)
+        assert cache.pop("live") == {"v": 1}
+        assert cache.pop("live") is None
+        assert cache.pop("old") is None
+
+    def test_expired_entry_removed_concurrently(self, monkeypatch):
+        """Test get tolerates another thread dropping an expired entry first."""
+        cache = TTLCache(default_ttl=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set("session", {"v": 1})
+        entry = cache._cache["session"]
+
+        class RacyDict(dict):
+            # Another thread deletes the key right after this one reads it
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                self.pop(key, None)
+                return value
+
+        cache._cache = RacyDict(session=entry)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1011.0)
+        assert cache.get("session") is None
+
+    def test_concurrent_set_and_cleanup(self):
+        """Test threads setting and cleaning up keep the heap consistent."""
+        import heapq
+        import threading
+
+        cache = TTLCache(default_ttl=60, max_entries=50)
+
+        def worker(n):
+            for i in range(2000):
+                cache.set(f"{n}-{i % 80}", {"v": i}, ttl=(i % 3) * 0.001)
+                cache.get(f"{n}-{(i + 1) % 80}")
+                if i % 100 == 0:
+                    cache.cleanup()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        heap = list(cache._heap)
+        heapq.heapify(heap)
+        assert heap == cache._heap
+        assert len(cache._cache) <= 50
+
+    def test_repeated_set_keeps_heap_bounded(self):
+        """Test re-setting one key does not grow the expiry heap."""
+        cache = TTLCache(default_ttl=60)
+        for i in range(1000):
+            cache.set("status", {"v": i})
+        assert len(cache._cache) == 1
+        assert len(cache._heap) <= 2
+        assert cache.get("status") == {"v": 999}
+
+    def test_equal_expiry_does_not_compare_keys(self, monkeypatch):
+        """Test keys that cannot be ordered share an expiry time safely."""
+        cache = TTLCache(default_ttl=10)
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1000.0)
+        cache.set((None, "us-east-1"), {"v": 1})
+        cache.set(("admin", "us-east-1"), {"v": 2})
+
+        monkeypatch.setattr("devops_cli.dashboard.utils.time.monotonic", lambda: 1011.0)
+        cache.cleanup()
+        assert cache._cache == {}
+
+
+class TestRedisSessionStore:
+    """Test the Redis-backed session store."""
+
+    class ResponseError(Exception):
+        pass
+
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+            self.expiry = {}
+            self.has_getdel = True
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, value, ex=None):
+            self.data[key] = value.encode()
+            self.expiry[key] = ex
+
+        def delete(self, key):
+            self.data.pop(key, None)
+
+        def getdel(self, key):
+            if not self.has_getdel:
+                raise TestRedisSessionStore.ResponseError("unknown command 'GETDEL'")
+            return self.data.pop(key, None)
+
+        def pipeline(self, transaction=True):
+            client = self
+
+            class Pipeline:
+                def __init__(self):
+                    self.calls = []
+
+                def get(self, key):
+                    self.calls.append(lambda: client.get(key))
+
+                def delete(self, key):
+                    self.calls.append(lambda: client.delete(key))
+
+                def execute(self):
+                    return [call() for call in self.calls]
+
+            return Pipeline()
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        from types import SimpleNamespace
+        from devops_cli.dashboard import utils
+
+        client = self.FakeRedis()
+        fake_redis = SimpleNamespace(
+            Redis=SimpleNamespace(from_url=lambda url: client),
+            exceptions=SimpleNamespace(ResponseError=self.ResponseError),
+        )
+        monkeypatch.setattr(utils, "redis", fake_redis, raising=False)
+        return utils.RedisSessionStore("redis://localhost", default_ttl=60)
+
+    def test_round_trip_with_expiry(self, store):
+        """Test sessions are stored as JSON with the default TTL."""
+        store.set("abc", {"user": {"email": "dev@example.com"}})
+        assert store.get("abc") == {"user": {"email": "dev@example.com"}}
+        assert store._client.expiry["devops-cli:session:abc"] == 60
+
+    def test_delete(self, store):
+        """Test a deleted session is gone."""
+        store.set("abc", {"user": {}})
+        store.delete("abc")
+        assert store.get("abc") is None
+
+    def test_pop(self, store):
+        """Test popping a session returns it and removes it."""
+        store.set("abc", {"user": {"email": "dev@example.com"}})
+        assert store.pop("abc") == {"user": {"email": "dev@example.com"}}
+        assert store.pop("abc") is None
+
+    def test_pop_without_getdel(self, store):
+        """Test servers older than Redis 6.2 fall back to GET and DEL."""
+        store._client.has_getdel = False
+        store.set("abc", {"user": {"email": "dev@example.com"}})
+        assert store.pop("abc") == {"user": {"email": "dev@example.com"}}
+        assert store.get("abc") is None
+        assert store._getdel_supported is False
+
+
+class TestTeamAccess:
+    """Test team-based resource matching."""
+
+    def test_wildcard_allows_everything(self):
+        """Test the '*' pattern grants access to any resource."""
+        assert can_access_resource("billing-api", ["*"]) is True
+
+    def test_glob_pattern(self):
+        """Test glob patterns match resource names."""
+        assert can_access_resource("billing-api", ["billing-*"]) is True
+        assert can_access_resource("auth-api", ["billing-*"]) is False
+
+    def test_no_patterns(self):
+        """Test an empty pattern list denies access."""
+        assert can_access_resource("billing-api", []) is False
+
+    def test_resource_access_mixed_patterns(self):
+        """Test plain names and globs are both honoured."""
+        access = logic.ResourceAccess(("auth-api", "billing-*"))
+        assert access.wildcard is False
+        assert access.allows("auth-api") is True
+        assert access.allows("billing-worker") is True
+        assert access.allows("auth-api-v2") is False
+
+    def test_filter_by_team_access(self, tmp_path, monkeypatch):
+        """Test items are filtered by the user's team patterns."""
+        teams = tmp_path / "teams.yaml"
+        teams.write_text(
+            "teams:\n"
+            "  default:\n    apps: ['*']\n"
+            "  payments:\n    apps: ['billing-*', 'ledger']\n"
+        )
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+        monkeypatch.setattr(
+            logic, "get_user_team", lambda email: email.split("@")[0]
+        )
+        items = [{"name": "billing-api"}, {"name": "ledger"}, {"name": "web"}]
+
+        payments = logic.filter_by_team_access(items, "payments@x.io", "apps")
+        assert [i["name"] for i in payments] == ["billing-api", "ledger"]
+        # Unknown teams fall back to the default team
+        assert logic.filter_by_team_access(items, "other@x.io", "apps") == items
+
+    def test_malformed_teams_file_denies_access(self, tmp_path, monkeypatch):
+        """Test an unparsable teams.yaml fails closed instead of allowing all."""
+        (tmp_path / "teams.yaml").write_text("teams:\n  ops: [apps: '*'\n")
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+
+        denied = logic.get_team_access("ops", "servers", missing=logic.DENY_ALL)
+        assert denied.allows("db-1") is False
+        assert logic.get_team_access("ops", "apps").allows("web") is False
+
+    def test_missing_teams_file_allows_all(self, tmp_path, monkeypatch):
+        """Test the allow-all default applies only when teams.yaml is absent."""
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+
+        access = logic.get_team_access("ops", "servers", missing=logic.DENY_ALL)
+        assert access.allows("db-1") is True
+
+    def test_missing_resource_type_default(self, tmp_path, monkeypatch):
+        """Test an unlisted resource type uses the supplied fallback."""
+        (tmp_path / "teams.yaml").write_text("teams:\n  ops:\n    apps: ['*']\n")
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+
+        assert logic.get_team_access("ops", "servers").allows("db-1") is True
+        denied = logic.get_team_access("ops", "servers", missing=logic.DENY_ALL)
+        assert denied.allows("db-1") is False
+
+
+class TestDeployments:
+    """Test the append-only deployments log."""
+
+    @pytest.fixture(autouse=True)
+    def deployments_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(logic, "DEPLOYMENTS_FILE", tmp_path / "deployments.json")
+        monkeypatch.setattr(logic, "DEPLOYMENTS_LOG", tmp_path / "deployments.jsonl")
+        monkeypatch.setattr(logic, "DEPLOYMENTS_LOCK_FILE", tmp_path / "deployments.lock")
+        return tmp_path
+
+    def test_empty(self):
+        """Test loading with no deployments recorded."""
+        assert logic.load_deployments() == []
+
+    def test_newest_first(self):
+        """Test deployments are returned newest first."""
+        logic.save_deployment({"app": "api", "status": "success"})
+        logic.save_deployment({"app": "web", "status": "failed"})
+        deployments = logic.load_deployments()
+        assert [d["app"] for d in deployments] == ["web", "api"]
+        assert deployments[0]["deployed_at"].endswith("Z")
+
+    def test_capped(self, monkeypatch):
+        """Test only the most recent deployments are kept."""
+        monkeypatch.setattr(logic, "MAX_DEPLOYMENTS", 3)
+        monkeypatch.setattr(logic, "DEPLOYMENTS_COMPACT_BYTES", 0)
+        for i in range(5):
+            logic.save_deployment({"app": f"app-{i}"})
+        deployments = logic.load_deployments()
+        assert [d["app"] for d in deployments] == ["app-4", "app-3", "app-2"]
+        assert len(logic.DEPLOYMENTS_LOG.read_text().splitlines()) == 3
+
+    def test_compaction_leaves_no_temp_files(self, deployments_dir, monkeypatch):
+        """Test compaction renames its own temp file over the log."""
+        monkeypatch.setattr(logic, "DEPLOYMENTS_COMPACT_BYTES", 0)
+        logic.save_deployment({"app": "api"})
+        logic.save_deployment({"app": "web"})
+        names = {p.name for p in deployments_dir.iterdir()}
+        assert names <= {"deployments.jsonl", "deployments.lock"}
+
+    def test_migrates_legacy_file(self, deployments_dir):
+        """Test history from deployments.json is carried over."""
+        import json
+
+        legacy = {"deployments": [{"app": "new"}, {"app": "old"}]}
+        (deployments_dir / "deployments.json").write_text(json.dumps(legacy))
+        assert [d["app"] for d in logic.load_deployments()] == ["new", "old"]
+
+        logic.save_deployment({"app": "latest"})
+        apps = [d["app"] for d in logic.load_deployments()]
+        assert apps == ["latest", "new", "old"]
+
+
+
+class TestActivity:
+    """Test the merged activity feed."""
+
+    def test_reloads_when_activity_file_changes(self, tmp_path, monkeypatch):
+        """Test cached activity is refreshed after a new entry is logged."""
+        monkeypatch.setattr(logic, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(logic, "ACTIVITY_FILE", tmp_path / "activity.json")
+        monkeypatch.setattr(logic, "_activity_cache", SignatureCache())
+        monkeypatch.setattr(logic, "_activity_file_cache", SignatureCache())
+        monkeypatch.setattr(logic, "activity_cache", TTLCache(default_ttl=3))
+
+        assert logic.load_activity() == []
+        logic.log_activity("deploy", "dev@example.com", "Deployed api")
+        assert [a["action"] for a in logic.load_activity()] == ["Deployed api"]
+        assert logic.load_activity() is logic.load_activity()
+
+        logic.log_activity("deploy", "dev@example.com", "Rolled back web app")
+        actions = [a["action"] for a in logic.load_activity()]
+        assert actions[0] == "Rolled back web app"
+
+    def test_external_edit_is_picked_up(self, tmp_path, monkeypatch):
+        """Test entries written by another process replace the cached copy."""
+        activity_file = tmp_path / "activity.json"
+        monkeypatch.setattr(logic, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(logic, "ACTIVITY_FILE", activity_file)
+        monkeypatch.setattr(logic, "_activity_cache", SignatureCache())
+        monkeypatch.setattr(logic, "_activity_file_cache", SignatureCache())
+        monkeypatch.setattr(logic, "activity_cache", TTLCache(default_ttl=3))
+
+        logic.log_activity("deploy", "dev@example.com", "Deployed api")
+        activity_file.write_text(
+            '{"activities": [{"timestamp": "2020-01-01T00:00:00Z", "action": "External"}]}'
+        )
+        logic.log_activity("deploy", "dev@example.com", "Deployed web")
+        actions = [a["action"] for a in logic.load_activity()]
+        assert actions == ["Deployed web", "External"]
+
+    def test_write_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        """Test each write renames its own temp file into place."""
+        activity_file = tmp_path / "activity.json"
+        monkeypatch.setattr(logic, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(logic, "ACTIVITY_FILE", activity_file)
+        monkeypatch.setattr(logic, "_activity_file_cache", SignatureCache())
+        monkeypatch.setattr(logic, "activity_cache", TTLCache(default_ttl=3))
+
+        for i in range(3):
+            logic.log_activity("deploy", "dev@example.com", f"Deployed {i}")
+        assert [p.name for p in tmp_path.iterdir()] == ["activity.json"]
+
+    def test_merges_audit_log_and_activity_file(self, tmp_path, monkeypatch):
+        """Test audit and custom entries are interleaved newest-first."""
+        activity_file = tmp_path / "activity.json"
+        monkeypatch.setattr(logic, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(logic, "ACTIVITY_FILE", activity_file)
+        monkeypatch.setattr(logic, "_activity_cache", SignatureCache())
+        monkeypatch.setattr(logic, "_activity_file_cache", SignatureCache())
+        monkeypatch.setattr(logic, "activity_cache", TTLCache(default_ttl=3))
+
+        (tmp_path / "auth").mkdir()
+        (tmp_path / "auth" / "audit.log").write_text(
+            "".join(f"2020-01-0{day}T00:00:00 | LOGIN_OK | a@example.com\n" for day in (1, 3, 5, 7, 9))
+        )
+        activity_file.write_text(
+            '{"activities": ['
+            + ", ".join(
+                f'{{"timestamp": "2020-01-0{day}T00:00:00Z", "action": "Custom {day}"}}'
+                for day in (8, 6, 4, 2)
+            )
+            + "]}"
+        )
+
+        days = [a["timestamp"][9] for a in logic.load_activity()]
+        assert days == ["9", "8", "7", "6", "5", "4", "3", "2", "1"]
+
+class TestDashboardSessions:
+    """Test dashboard login sessions."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from fastapi.testclient import TestClient
+        from devops_cli.dashboard import main
+        from devops_cli.dashboard.routes import auth
+
+        user = {"email": "dev@example.com", "role": "developer"}
+        monkeypatch.setattr(main.auth_manager, "login", lambda email, token: True)
+        monkeypatch.setattr(main.auth_manager, "list_users", lambda: [user])
+        monkeypatch.setattr(auth, "log_activity", lambda *args, **kwargs: None)
+        monkeypatch.setattr(main, "sessions", main.TTLCache(default_ttl=60))
+        monkeypatch.setattr(auth, "sessions", main.sessions)
+        return TestClient(main.app)
+
+    def test_login_and_logout(self, client):
+        """Test a session is created on login and removed on logout."""
+        assert client.get("/api/auth/status").json() == {"authenticated": False}
+
+        response = client.post(
+            "/api/auth/login", json={"email": "dev@example.com", "token": "t"}
+        )
+        assert response.json()["success"] is True
+        status = client.get("/api/auth/status").json()
+        assert status["authenticated"] is True
+        assert status["user"]["email"] == "dev@example.com"
+
+        client.post("/api/auth/logout")
+        assert client.get("/api/auth/status").json() == {"authenticated": False}
+
+    def test_bytecode_cache_created_at_startup(self, tmp_path, monkeypatch):
+        """Test the template cache directory is only created when enabled."""
+        from devops_cli.dashboard import main
+
+        cache_dir = tmp_path / "jinja_cache"
+        monkeypatch.setattr(main, "JINJA_CACHE_DIR", cache_dir)
+        monkeypatch.setattr(main.templates.env, "bytecode_cache", None)
+        assert not cache_dir.exists()
+
+        main._enable_bytecode_cache()
+        assert cache_dir.is_dir()
+        assert main.templates.env.bytecode_cache is not None
+
+    def test_bytecode_cache_skipped_when_unwritable(self, tmp_path, monkeypatch):
+        """Test an unusable cache directory leaves templates uncached."""
+        from devops_cli.dashboard import main
+
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        monkeypatch.setattr(main, "JINJA_CACHE_DIR", blocker / "jinja_cache")
+        monkeypatch.setattr(main.templates.env, "bytecode_cache", None)
+
+        main._enable_bytecode_cache()
+        assert main.templates.env.bytecode_cache is None
+
+    def test_warm_caches_survives_broken_config(self, monkeypatch, caplog):
+        """Test a malformed config file is logged instead of raised at startup."""
+        from devops_cli.dashboard import main
+
+        def broken():
+            raise ValueError("bad activity.json")
+
+        monkeypatch.setattr(main, "load_activity", broken)
+        main._warm_caches()
+        assert "bad activity.json" in caplog.text
+
+
+class TestMonitoringSummary:
+    """Test monitoring result conversion."""
+
+    def test_summarize_counts_all_groups(self):
+        """Test statuses are counted across websites, apps and servers."""
+        from devops_cli.dashboard.routes.monitoring import (
+            _result_to_stream_dict,
+            _summarize,
+        )
+        from devops_cli.monitoring.checker import HealthResult, HealthStatus
+
+        def result(name, status):
+            return HealthResult(name=name, resource_type="app", status=status)
+
+        results = {
+            "websites": [result("site", HealthStatus.HEALTHY)],
+            "apps": [
+                result("api", HealthStatus.UNHEALTHY),
+                result("web", HealthStatus.DEGRADED),
+            ],
+            "servers": [result("db", HealthStatus.UNKNOWN)],
+        }
+        assert _summarize(results) == {
+            "online": 1,
+            "offline": 1,
+            "degraded": 1,
+            "unknown": 1,
+            "total": 4,
+        }
+        assert _result_to_stream_dict(results["apps"][1])["status"] == "degraded"
+
+    def test_stream_reports_hung_check_as_unknown(self, monkeypatch):
+        """Test one hung check does not drop the other results in a round."""
+        import asyncio
+        from devops_cli.dashboard.routes import monitoring
+        from devops_cli.monitoring.checker import HealthResult, HealthStatus
+        from devops_cli.monitoring.config import AppConfig
+
+        class FakeConfig:
+            def get_websites(self):
+                return []
+
+            def get_apps(self):
+                return [
+                    AppConfig(name="fast", type="http", identifier="fast"),
+                    AppConfig(name="hung", type="http", identifier="hung"),
+                ]
+
+            def get_servers(self):
+                return []
+
+        class FakeChecker:
+            async def check_app(self, app):
+                if app.name == "hung":
+                    await asyncio.sleep(10)
+                return HealthResult(name=app.name, resource_type="app", status=HealthStatus.HEALTHY)
+
+        monkeypatch.setattr(monitoring, "STREAM_CHECK_TIMEOUT_SECONDS", 0.05)
+        data = asyncio.run(monitoring._check_stream_status(FakeConfig(), FakeChecker()))
+        assert [(a["name"], a["status"]) for a in data["apps"]] == [
+            ("fast", "online"),
+            ("hung", "degraded"),
+        ]
+        assert data["summary"] == {"online": 1, "offline": 0, "total": 2}
+
+    def test_filter_configs_by_team(self, tmp_path, monkeypatch):
+        """Test monitoring configs are filtered by name for the team."""
+        from devops_cli.dashboard.routes.monitoring import _filter_configs
+        from devops_cli.monitoring.config import AppConfig
+
+        (tmp_path / "teams.yaml").write_text(
+            "teams:\n  payments:\n    apps: ['billing-*']\n    servers: ['*']\n"
+        )
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+        apps = [
+            AppConfig(name="billing-api", type="docker", identifier="billing"),
+            AppConfig(name="web", type="docker", identifier="web"),
+        ]
+
+        assert [a.name for a in _filter_configs(apps, "payments", "apps")] == ["billing-api"]
+        assert _filter_configs(apps, "payments", "servers") is apps
+
+    def test_stale_while_revalidate(self, monkeypatch):
+        """Test concurrent misses compute once and stale results refresh in the background."""
+        import asyncio
+        import json
+        from devops_cli.dashboard.routes import monitoring
+
+        now = [1000.0]
+        calls = []
+
+        async def compute(team):
+            calls.append(team)
+            await asyncio.sleep(0)
+            return {"run": len(calls)}
+
+        monkeypatch.setattr(monitoring.time, "time", lambda: now[0])
+        monkeypatch.setattr(monitoring, "_compute_monitoring", compute)
+        monkeypatch.setattr(monitoring, "monitoring_cache", TTLCache(default_ttl=30))
+        monkeypatch.setattr(monitoring, "_monitoring_locks", {})
+        monkeypatch.setattr(monitoring, "_monitoring_refreshes", {})
+        admin = {"email": "admin@example.com", "role": "admin"}
+
+        async def fetch():
+            response = await monitoring.api_monitoring(user=admin)
+            return json.loads(response.body)
+
+        async def scenario():
+            first = await asyncio.gather(fetch(), fetch())
+            assert first == [{"run": 1}, {"run": 1}]
+
+            now[0] += monitoring.MONITORING_FRESH_SECONDS
+            # Stale data is returned at once while one refresh is scheduled
+            assert await fetch() == {"run": 1}
+            assert await fetch() == {"run": 1}
+            await monitoring._monitoring_refreshes["status"]
+            assert await fetch() == {"run": 2}
+
+        asyncio.run(scenario())
+        assert calls == [None, None]
+
+
+class TestMeetings:
+    """Test meeting ranking."""
+
+    def test_meeting_minutes(self):
+        """Test 24h and 12h times rank by minutes, invalid times last."""
+        from devops_cli.dashboard.routes.meetings import _meeting_minutes
+
+        assert _meeting_minutes("09:30") == 570
+        assert _meeting_minutes("9:30 pm") == 21 * 60 + 30
+        assert _meeting_minutes("12:05 AM") == 5
+        assert _meeting_minutes("12:05 PM") == 12 * 60 + 5
+        assert _meeting_minutes("") == _meeting_minutes("25:00") == 23 * 60 + 59
+
+    def test_single_digit_minutes(self):
+        """Test single-digit minutes parse as strptime did."""
+        from devops_cli.dashboard.routes.meetings import _meeting_minutes
+
+        assert _meeting_minutes("9:5") == 9 * 60 + 5
+        assert _meeting_minutes("9:5 PM") == 21 * 60 + 5
+
+
+class TestAppsView:
+    """Test the normalized apps listing."""
+
+    def test_view_rebuilt_only_for_new_config(self, monkeypatch):
+        """Test the normalized list is reused until the config object changes."""
+        import asyncio
+        from devops_cli.dashboard.routes import apps
+
+        config = {"apps": {"api": {"log_group": "/ecs/api", "region": "eu-west-1"}}}
+        monkeypatch.setattr(apps, "load_apps_config", lambda: config)
+        monkeypatch.setattr(apps, "_apps_view_cache", SignatureCache())
+        admin = {"email": "admin@example.com", "role": "admin"}
+
+        first = asyncio.run(apps.api_apps(user=admin))["apps"]
+        assert first[0]["logs"] == {
+            "type": "cloudwatch", "log_group": "/ecs/api", "region": "eu-west-1"
+        }
+        assert asyncio.run(apps.api_apps(user=admin))["apps"] is first
+
+        config = {"apps": {"web": {}}}
+        assert [a["name"] for a in asyncio.run(apps.api_apps(user=admin))["apps"]] == ["web"]
+
+
+class TestDocumentLogs:
+    """Test logs read from uploaded documents."""
+
+    def test_reads_first_entries_only(self, tmp_path, monkeypatch):
+        """Test only the leading entries of a document are parsed."""
+        from devops_cli.dashboard import services
+
+        (tmp_path / "metadata.json").write_text(
+            '{"documents": {"api": {"filename": "api.log"}}}'
+        )
+        lines = ["Error: boot failed", "", "warning: slow"]
+        lines += [f"line {i}" for i in range(200)]
+        (tmp_path / "api.log").write_text("\n".join(lines))
+        monkeypatch.setattr(services, "DOCUMENTS_DIR", tmp_path)
+        monkeypatch.setattr(services, "_documents_metadata_cache", SignatureCache())
+
+        result = services.get_document_logs("api")
+        assert result["success"] is True
+        # Blank lines are skipped without using up the limit
+        assert len(result["logs"]) == services.DOCUMENT_LOG_LINES
+        assert [log["level"] for log in result["logs"][:3]] == ["ERROR", "WARN", "INFO"]
+        assert result["logs"][0]["message"] == "Error: boot failed"
+
+    def test_level_filter(self, tmp_path, monkeypatch):
+        """Test only entries at the requested level are returned."""
+        from devops_cli.dashboard import services
+
+        (tmp_path / "metadata.json").write_text(
+            '{"documents": {"api": {"filename": "api.log"}}}'
+        )
+        (tmp_path / "api.log").write_text("ERROR one\ninfo two\nerror three\n")
+        monkeypatch.setattr(services, "DOCUMENTS_DIR", tmp_path)
+        monkeypatch.setattr(services, "_documents_metadata_cache", SignatureCache())
+
+        result = services.get_document_logs("api", level_filter="ERROR")
+        assert [log["message"] for log in result["logs"]] == ["ERROR one", "error three"]
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        """Test a metadata entry without its file reports an error."""
+        from devops_cli.dashboard import services
+
+        (tmp_path / "metadata.json").write_text(
+            '{"documents": {"api": {"filename": "gone.log"}}}'
+        )
+        monkeypatch.setattr(services, "DOCUMENTS_DIR", tmp_path)
+        monkeypatch.setattr(services, "_documents_metadata_cache", SignatureCache())
+
+        result = services.get_document_logs("api")
+        assert result == {"success": False, "error": "Document file not found"}
+
+
+
+class TestLogsClient:
+    """Test CloudWatch Logs client reuse."""
+
+    def test_client_reused_per_role_and_region(self, monkeypatch):
+        """Test a client is built once per (role, region) pair."""
+        import asyncio
+        from devops_cli.dashboard import services
+
+        built = []
+
+        class Session:
+            def __init__(self, role_name, region):
+                self.key = (role_name, region)
+
+            def client(self, name):
+                built.append(self.key)
+                return object()
+
+        monkeypatch.setattr(services, "get_aws_session", Session)
+        monkeypatch.setattr(services, "_logs_clients", TTLCache(default_ttl=60))
+
+        async def fetch():
+            first = await services.get_logs_client("us-east-1", "ops")
+            again = await services.get_logs_client("us-east-1", "ops")
+            other = await services.get_logs_client("eu-west-1", "ops")
+            return first, again, other
+
+        first, again, other = asyncio.run(fetch())
+        assert first is again
+        assert other is not first
+        assert built == [("ops", "us-east-1"), ("ops", "eu-west-1")]
+
+    def test_fetch_merges_streams_newest_first(self, monkeypatch):
+        """Test events from several streams come back newest first."""
+        import asyncio
+        from devops_cli.dashboard import services
+
+        events = {
+            "a": [{"timestamp": 1000, "message": "a1"}, {"timestamp": 3000, "message": "ERROR a2"}],
+            "b": [{"timestamp": 2000, "message": "b1"}, {"timestamp": 4000, "message": "b2"}],
+        }
+
+        class Client:
+            def describe_log_streams(self, **kwargs):
+                return {"logStreams": [{"logStreamName": "a"}, {"logStreamName": "b"}]}
+
+            def get_log_events(self, logStreamName, **kwargs):
+                return {"events": events[logStreamName]}
+
+        async def get_client(region, aws_role=None):
+            return Client()
+
+        monkeypatch.setattr(services, "get_logs_client", get_client)
+
+        result = asyncio.run(services.fetch_cloudwatch_logs("group", "us-east-1", lines=3))
+        assert [log["message"] for log in result["logs"]] == ["b2", "ERROR a2", "b1"]
+        assert result["logs"][1]["level"] == "ERROR"
+        assert result["logs"][1]["source"] == "a"
+
+class TestGitHubRequests:
+    """Test GitHub API calls made by the dashboard."""
+
+    def test_not_modified_reuses_cached_body(self, monkeypatch):
+        """Test a 304 response returns the previously cached JSON."""
+        import asyncio
+        import httpx
+        from devops_cli.dashboard.routes import github
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"default_branch": "trunk"}, headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        class Pool:
+            async def get_client(self):
+                return client
+
+        monkeypatch.setattr(github, "HTTPClientPool", Pool)
+        monkeypatch.setattr(github, "github_cache", TTLCache(default_ttl=60))
+
+        url = "https://api.github.com/repos/acme/api"
+        first = asyncio.run(github._github_get(url, {}))
+        second = asyncio.run(github._github_get(url, {}))
+        assert first == second == (200, {"default_branch": "trunk"})
+        assert seen == [None, '"v1"']
+
+    def test_head_commit_from_graphql(self, monkeypatch):
+        """Test the default branch head commit is read from one GraphQL query."""
+        import asyncio
+        import httpx
+        from devops_cli.dashboard.routes import github
+
+        commit = {
+            "oid": "0123456789abcdef",
+            "message": "Fix login\n\nDetails",
+            "url": "https://github.com/acme/api/commit/0123456",
+            "author": {"name": "Dev", "date": "2024-01-01T00:00:00Z"},
+        }
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url.path)
+            data = {"repository": {"defaultBranchRef": {"target": commit}}}
+            return httpx.Response(200, json={"data": data})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        class Pool:
+            async def get_client(self):
+                return client
+
+        monkeypatch.setattr(github, "HTTPClientPool", Pool)
+
+        result = asyncio.run(github._get_head_commit_graphql("acme", "api", "t"))
+        assert requests_seen == ["/graphql"]
+        assert result["sha"] == "0123456"
+        assert result["message"] == "Fix login"
+        assert result["author"] == "Dev"
+
+    def test_security_alerts_tolerate_failed_lookup(self, monkeypatch):
+        """Test a failing alert source counts as empty and the rest are summarized."""
+        import asyncio
+        from devops_cli.dashboard.routes import github
+
+        def failing(owner, repo, token):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(github, "get_github_config", lambda: {"github": {"token": "t"}})
+        monkeypatch.setattr(github, "github_cache", TTLCache(default_ttl=60))
+        monkeypatch.setattr(
+            github,
+            "get_dependabot_alerts",
+            lambda owner, repo, token: [{"severity": "high"}, {"severity": "low"}],
+        )
+        monkeypatch.setattr(github, "get_secret_scanning_alerts", failing)
+        monkeypatch.setattr(
+            github, "get_code_scanning_alerts", lambda owner, repo, token: [{"severity": "high"}]
+        )
+
+        result = asyncio.run(github.api_repo_security("acme", "api", user={}))
+        assert result["summary"] == {
+            "total": 3, "critical": 0, "high": 2, "medium": 0, "low": 1
+        }
+        assert result["alerts"]["secret_scanning"] == []
+
+    def test_repos_follow_pagination(self, monkeypatch):
+        """Test every page named by the Link header is fetched and combined."""
+        import asyncio
+        import httpx
+        from devops_cli.dashboard.routes import github
+
+        def repo(name):
+            return {"name": name, "html_url": f"https://github.com/acme/{name}"}
+
+        def handler(request):
+            page = int(request.url.params.get("page", "1"))
+            headers = {}
+            if page == 1:
+                last = str(request.url.copy_set_param("page", "3"))
+                headers["Link"] = f'<{last}>; rel="next", <{last}>; rel="last"'
+            return httpx.Response(200, json=[repo(f"repo-{page}")], headers=headers)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        class Pool:
+            async def get_client(self):
+                return client
+
+        monkeypatch.setattr(github, "HTTPClientPool", Pool)
+        monkeypatch.setattr(github, "github_cache", TTLCache(default_ttl=60))
+        monkeypatch.setattr(github, "get_github_config", lambda: {"github": {"org": "acme"}})
+        monkeypatch.setattr(github, "get_user_team", lambda email: "default")
+
+        result = asyncio.run(
+            github.api_github_repos(user={"email": "admin@example.com", "role": "admin"})
+        )
+        assert [r["name"] for r in result["repos"]] == ["repo-1", "repo-2", "repo-3"]
+
+    def test_repos_filtered_for_non_admin_teams(self, tmp_path, monkeypatch):
+        """Test non-admins see their team's repos, wildcard teams see all."""
+        import asyncio
+        from devops_cli.dashboard.routes import github
+
+        (tmp_path / "teams.yaml").write_text(
+            "teams:\n"
+            "  payments:\n    repos: ['billing-*', 'docs']\n"
+            "  platform:\n    repos: ['*']\n"
+            "  support:\n    apps: ['*']\n"
+        )
+        use_teams_file(monkeypatch, tmp_path / "teams.yaml")
+        cache = TTLCache(default_ttl=60)
+        names = ["billing-api", "billing-web", "docs", "infra"]
+        cache.set("github_repos:acme", [{"name": n} for n in names])
+        monkeypatch.setattr(github, "github_cache", cache)
+        monkeypatch.setattr(github, "get_github_config", lambda: {"github": {"org": "acme"}})
+        teams = {
+            "pay@example.com": "payments",
+            "ops@example.com": "platform",
+            "help@example.com": "support",
+        }
+        monkeypatch.setattr(github, "get_user_team", teams.get)
+
+        def visible(email, role="developer"):
+            result = asyncio.run(github.api_github_repos(user={"email": email, "role": role}))
+            assert result["all_count"] == len(names)
+            return [r["name"] for r in result["repos"]]
+
+        assert visible("pay@example.com") == ["billing-api", "billing-web", "docs"]
+        assert visible("pay@example.com", role="admin") == names
+        assert visible("ops@example.com") == names
+        # Teams without a 'repos' entry are not restricted
+        assert visible("help@example.com") == names
+
+    def test_concurrent_misses_share_one_fetch(self, monkeypatch):
+        """Test simultaneous cold requests for one repo fetch its alerts once."""
+        import asyncio
+        from devops_cli.dashboard.routes import github
+
+        calls = []
+
+        async def fetch(owner, repo, token):
+            calls.append(repo)
+            await asyncio.sleep(0)
+            return {"summary": {"total": 0}}
+
+        monkeypatch.setattr(github, "get_github_config", lambda: {"github": {"token": "t"}})
+        monkeypatch.setattr(github, "github_cache", TTLCache(default_ttl=60))
+        monkeypatch.setattr(github, "_fetch_locks", {})
+        monkeypatch.setattr(github, "_fetch_repo_security", fetch)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(github.api_repo_security("acme", "api", user={}) for _ in range(3))
+            )
+
+        assert asyncio.run(scenario()) == [{"summary": {"total": 0}}] * 3
+        assert calls == ["api"]
+        assert github._fetch_locks == {}
@@ -5,6 +5,8 @@ from devops_cli.utils.output import (
     status_badge,
     create_table,
 )
+from devops_cli.utils.log_formatters import detect_log_level
+from devops_cli.utils.file_cache import SignatureCache, file_signature
 
 
 class TestOutputUtils:
@@ -37,3 +39,46 @@ class TestOutputUtils:
         table = create_table("Test Table", [("Col1", "cyan"), ("Col2", "dim")])
         assert table is not None
         assert table.title == "Test Table"
+
+
+class TestLogFormatters:
+    """Test log formatting helpers."""
+
+    def test_detect_log_level_error(self):
+        """Test error lines are classified as ERROR."""
+        assert detect_log_level("request failed: error 500") == "ERROR"
+
+    def test_detect_log_level_error_wins_over_warn(self):
+        """Test ERROR takes priority over an earlier WARN."""
+        assert detect_log_level("WARN retry after ERROR") == "ERROR"
+
+    def test_detect_log_level_warn(self):
+        """Test warning lines are classified as WARN."""
+        assert detect_log_level("[Warning] disk almost full") == "WARN"
+
+    def test_detect_log_level_default(self):
+        """Test other lines default to INFO."""
+        assert detect_log_level("server started") == "INFO"
+
+
+class TestFileCache:
+    """Test file signature caching helpers."""
+
+    def test_file_signature(self, tmp_path):
+        """Test a signature changes with the file and is None when missing."""
+        path = tmp_path / "data.json"
+        assert file_signature(path) is None
+        path.write_text("{}")
+        first = file_signature(path)
+        path.write_text('{"a": 1}')
+        assert file_signature(path) != first
+
+    def test_signature_cache(self):
+        """Test values are returned only for the signature they were built from."""
+        cache = SignatureCache()
+        assert cache.get((1, 2)) is None
+        assert cache.set((1, 2), ["a"]) == ["a"]
+        assert cache.get((1, 2)) == ["a"]
+        assert cache.get((1, 3)) is None
+        cache.clear()
+        assert cache.get((1, 2)) is None